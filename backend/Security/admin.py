@@ -0,0 +1,12 @@
+import secrets
+from fastapi import Header, HTTPException, status
+
+from config.api import settings
+
+
+async def admin_required(x_admin_key: str | None = Header(default=None)):
+    """Guard for operator endpoints; disabled unless ADMIN_API_KEY is set"""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
@@ -1,6 +1,12 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
-from config.database import get_db
+from config.api import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -12,3 +18,116 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords in one worker call (bulk provisioning)"""
+    return [get_password_hash(password) for password in passwords]
+
+
+def hash_in_pool(chunks: List[List[str]], workers: int) -> List[List[str]]:
+    """Hash chunks in a short-lived spawn pool; blocks until it has shut down"""
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        return list(executor.map(hash_passwords, chunks))
+
+
+class PasswordHasher:
+    """
+    Async front for bcrypt backed by a bounded process pool.
+    Keeps hashing off the event loop, caps concurrent hashes and rejects
+    callers with 503 once the wait queue is full so login storms degrade
+    instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_concurrency: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor: ProcessPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork a worker that holds the event loop / DB sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: List[str], workers: int | None = None) -> List[str]:
+        """
+        Hash a large batch in a dedicated, short-lived pool so bulk jobs
+        never queue in front of interactive logins.
+        """
+        if not passwords:
+            return []
+        workers = workers or self.max_workers
+        chunk_size = max(1, -(-len(passwords) // (workers * 4)))
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+
+        # Spawning the workers and joining them on shutdown both block:
+        # the pool's whole lifetime runs in a thread, not on the event loop
+        hashed_chunks = await asyncio.to_thread(hash_in_pool, chunks, workers)
+        return [hashed for chunk in hashed_chunks for hashed in chunk]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
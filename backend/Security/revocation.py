@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from config.api import settings
+from models.token_version import TokenVersion
+from Security.cache import TTLCache, invalidate_principal, principal_cache
+
+TOKEN_VERSION_QUERY = select(TokenVersion.version).where(TokenVersion.user_id == bindparam("user_id"))
+
+# pg_notify channel of the principal_notify_change triggers (payload: user id)
+PRINCIPAL_CHANNEL = "principal_changes"
+
+
+class TokenVersionRegistry:
+    """
+    Per-user token version used to decide whether tier claims in a JWT
+    are still current. Versions live in `token_versions` and are cached
+    in-process so the premium check normally needs no query at all.
+    """
+
+    def __init__(self, cache: TTLCache):
+        self._cache = cache
+
+    async def current(self, db: AsyncSession, user_id: str | uuid.UUID) -> int:
+        key = str(user_id)
+        version = self._cache.get(key)
+        if version is not None:
+            return version
+
+        result = await db.execute(TOKEN_VERSION_QUERY, {"user_id": uuid.UUID(key)})
+        version = result.scalar_one_or_none() or 0
+        self._cache.set(key, version)
+        return version
+
+    async def bump(self, db: AsyncSession, user_id: str | uuid.UUID) -> int:
+        """
+        Increment the user's version inside the caller's transaction.
+        Call remember() with the result once the transaction commits.
+        """
+        stmt = insert(TokenVersion).values(
+            user_id=user_id, version=1, updated_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TokenVersion.user_id],
+            set_={
+                "version": TokenVersion.version + 1,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(TokenVersion.version)
+        result = await db.execute(stmt)
+        return result.scalar_one()
+
+    def remember(self, user_id: str | uuid.UUID, version: int) -> None:
+        self._cache.set(str(user_id), version)
+
+    def forget(self, user_id: str | uuid.UUID) -> None:
+        self._cache.invalidate(str(user_id))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+
+token_versions = TokenVersionRegistry(
+    TTLCache(
+        max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+        ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+    )
+)
+
+
+def principal_changed(user_id: str) -> None:
+    """
+    A user, subscription or token version row changed on some worker
+    (PRINCIPAL_CHANNEL): drop this worker's cached principal and version,
+    so a downgrade or revocation applies at once instead of after the TTLs.
+    """
+    invalidate_principal(user_id)
+    token_versions.forget(user_id)
+
+
+def forget_principals() -> None:
+    """Changes may have been missed (no LISTEN connection): drop everything"""
+    principal_cache.clear()
+    token_versions.clear()
@@ -1,28 +1,80 @@
+import hashlib
+import hmac
+import uuid
 from datetime import datetime, timedelta
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from config.database import get_db
+from config.database import AsyncSessionLocal, get_db, open_read_session
 from config.api import settings
 from crud import auth as crud_auth
+from schemas.user import Principal
+from Security.cache import principal_cache, invalidate_principal
+from Security.revocation import token_versions
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-def create_access_token(data: dict, expires_delta: timedelta | None = None):
+# Read-your-writes marker: responses to requests that wrote carry the
+# primary's WAL position, signed; clients send the latest one back
+READ_MARKER_HEADER = "X-Read-After"
+
+def create_access_token(
+    data: dict,
+    expires_delta: timedelta | None = None,
+    tier: str | None = None,
+    token_version: int | None = None,
+):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
+
+    # Tier claims are only trusted together with the version they were minted at
+    if tier is not None and token_version is not None:
+        to_encode.update({"tier": tier, "ver": token_version})
+
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-):
+def create_principal_token(principal: Principal, expires_delta: timedelta | None = None):
+    """Mint an access token carrying the principal's tier claims"""
+    return create_access_token(
+        data={"sub": str(principal.id)},
+        expires_delta=expires_delta,
+        tier=principal.subscription_tier,
+        token_version=principal.token_version,
+    )
+
+
+def _read_marker_signature(lsn: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), f"read-after:{lsn}".encode(), hashlib.sha256).hexdigest()
+
+
+def create_read_marker(lsn: str) -> str:
+    return f"{lsn}.{_read_marker_signature(lsn)}"
+
+
+def read_marker_lsn(marker: str | None) -> str | None:
+    """WAL position from a read marker; None when missing or not signed by us"""
+    if not marker:
+        return None
+    lsn, _, signature = marker.rpartition(".")
+    if not lsn or not hmac.compare_digest(signature, _read_marker_signature(lsn)):
+        return None
+    return lsn
+
+
+def needs_refresh(payload: dict) -> bool:
+    """True once the token is within the refresh window of its expiry"""
+    expires_at = datetime.utcfromtimestamp(payload.get("exp", 0))
+    window = timedelta(minutes=settings.ACCESS_TOKEN_REFRESH_WINDOW_MINUTES)
+    return expires_at - datetime.utcnow() <= window
+
+
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -33,17 +85,70 @@ async def get_current_user(
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-    except JWTError:
+        uuid.UUID(user_id)
+    except (JWTError, ValueError):
         raise credentials_exception
+    return payload
 
-    user = await crud_auth.get_user_by_id(db, user_id)
-    if user is None:
-        raise credentials_exception
-    return user
+
+async def resolve_principal(db: AsyncSession, user_id: str) -> Principal | None:
+    # Serve from the per-worker principal cache before touching Postgres
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    principal = await crud_auth.get_principal(db, user_id)
+    if principal is not None:
+        principal_cache.set(str(principal.id), principal)
+    return principal
+
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db)
+):
+    principal = await resolve_principal(db, payload["sub"])
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+async def get_read_db(read_after: str | None = Header(None, alias=READ_MARKER_HEADER)):
+    """
+    Read-only session: the replica when one is configured, the primary
+    while the replica has not replayed the client's last write (read marker).
+    """
+    session = await open_read_session(read_marker_lsn(read_after))
+    async with session:
+        yield session
+
+
+async def get_current_reader(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """get_current_user for read-only routes, resolved on get_read_db"""
+    principal = await resolve_principal(db, payload["sub"])
+    if principal is None:
+        # A user created moments ago may not have reached the replica yet
+        async with AsyncSessionLocal() as primary:
+            principal = await resolve_principal(primary, payload["sub"])
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
 
 
 async def premium_user(
-    current_user = Depends(get_current_user),
+    payload: dict = Depends(get_token_payload),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     premium_exception = HTTPException(
@@ -51,11 +156,23 @@ async def premium_user(
         detail="Access restricted to premium users"
     )
 
-    # Fetch subscription info (await required if async)
-    active_subscription = await crud_auth.get_user_with_subscription(db, current_user.id)
+    claimed_tier = payload.get("tier")
+    claimed_version = payload.get("ver")
+    if claimed_tier is not None and claimed_version is not None:
+        if claimed_version == await token_versions.current(db, current_user.id):
+            # Claims are current: no subscription read needed
+            if claimed_tier == "free":
+                raise premium_exception
+            return current_user
+
+        # Tier or password changed since the token was minted: re-read the row
+        invalidate_principal(current_user.id)
+        current_user = await resolve_principal(db, str(current_user.id))
+        if current_user is None:
+            raise premium_exception
 
-    # Handle missing subscription or free plan
-    if not active_subscription or active_subscription.tier == "free":
+    # Tier is resolved together with the user (missing subscription -> free)
+    if current_user.subscription_tier == "free":
         raise premium_exception
 
-    return current_user
\ No newline at end of file
+    return current_user
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from alembic import context
 
 from config.api import settings
-from models import user, task, subscription  
+from models import user, task, subscription, token_version, user_task_stats, task_tombstone, task_import, task_archive, task_id
 from config.database import Base 
 
 # Alembic Config
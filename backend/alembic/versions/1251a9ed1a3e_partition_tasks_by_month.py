@@ -0,0 +1,323 @@
+"""partition tasks by month on created_at
+
+Revision ID: 1251a9ed1a3e
+Revises: 94e3a155bdc9
+Create Date: 2026-10-18 16:12:09.583140
+
+Online conversion:
+  0. give every row a created_at (the partition key), stored once in tasks
+  1. create tasks_partitioned (PK (id, created_at)) with monthly partitions
+     and every tasks index, plus the task_ids registry
+  2. mirror writes on tasks into both with a row trigger
+  3. copy existing rows in short, separately committed batches
+  4. swap the tables in one short transaction and move the triggers over
+
+Steps 0-3 are idempotent, so a failed run (e.g. lock_timeout at the swap)
+can simply be retried.
+
+A unique index on a partitioned table must include the partition key, so
+the PK alone no longer makes id unique. task_ids (id PRIMARY KEY) is kept
+in step by statement triggers and rejects a duplicate id in any partition.
+
+There is no DEFAULT partition: a row in a month without a partition fails
+instead of landing somewhere tasks_ensure_partitions could no longer create
+that month. The app keeps TASK_PARTITION_MONTHS_AHEAD months created.
+"""
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1251a9ed1a3e'
+down_revision: Union[str, Sequence[str], None] = '94e3a155bdc9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COPY_BATCH_SIZE = 5000
+COPY_PAUSE_SECONDS = 0.05
+PARTITION_MONTHS_AHEAD = 3
+
+COLUMNS = ('id, owner_id, title, description, status, due_date, created_at, '
+           'updated_at, start_at, end_at, search_vector')
+
+SOURCE_COLUMNS = ('{t}.id, {t}.owner_id, {t}.title, {t}.description, {t}.status, {t}.due_date, '
+                  '{t}.created_at, {t}.updated_at, {t}.start_at, {t}.end_at, {t}.search_vector')
+
+# (name, columns, options): every index tasks has at 94e3a155bdc9
+TASK_INDEXES = [
+    ('ix_tasks_due_date', ['due_date'], {}),
+    ('ix_tasks_owner_created_covering', ['owner_id', 'created_at', 'id'],
+     {'postgresql_include': ['status', 'due_date', 'start_at', 'end_at']}),
+    ('ix_tasks_owner_due_id', ['owner_id', 'due_date', 'id'], {}),
+    ('ix_tasks_owner_title_id', ['owner_id', 'title', 'id'], {}),
+    ('ix_tasks_owner_status_id', ['owner_id', 'status', 'id'], {}),
+    ('ix_tasks_owner_updated_id', ['owner_id', 'updated_at', 'id'], {}),
+    ('ix_tasks_owner_due_open', ['owner_id', 'due_date'],
+     {'postgresql_where': sa.text("status <> 'completed'")}),
+    ('ix_tasks_search_vector', ['search_vector'], {'postgresql_using': 'gin'}),
+]
+
+# (name, when, level, function): every trigger tasks has at 94e3a155bdc9
+TASK_TRIGGERS = [
+    ('tasks_search_vector_update', 'BEFORE INSERT OR UPDATE OF title, description',
+     'FOR EACH ROW', 'tasks_search_vector_update()'),
+    ('tasks_count_insert', 'AFTER INSERT',
+     'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT', 'user_task_stats_on_insert()'),
+    ('tasks_count_delete', 'AFTER DELETE',
+     'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT', 'user_task_stats_on_delete()'),
+    ('tasks_version_update', 'AFTER UPDATE',
+     'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT', 'user_task_stats_on_update()'),
+    ('tasks_tombstone', 'AFTER DELETE',
+     'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT', 'task_tombstones_on_delete()'),
+    ('tasks_notify_insert', 'AFTER INSERT',
+     'REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT', 'tasks_notify_changes()'),
+    ('tasks_notify_update', 'AFTER UPDATE',
+     'REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT', 'tasks_notify_changes()'),
+    ('tasks_notify_delete', 'AFTER DELETE',
+     'REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT', 'tasks_notify_changes()'),
+]
+
+
+# Keep task_ids in step with the partitioned tasks (new in this revision)
+TASK_ID_TRIGGERS = [
+    ('tasks_ids_insert', 'AFTER INSERT',
+     'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT', 'task_ids_on_insert()'),
+    ('tasks_ids_delete', 'AFTER DELETE',
+     'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT', 'task_ids_on_delete()'),
+]
+
+
+def create_task_triggers(table: str, triggers=TASK_TRIGGERS) -> None:
+    for name, when, level, function in triggers:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+        op.execute(f"CREATE TRIGGER {name} {when} ON {table} {level} EXECUTE FUNCTION {function}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Creates the monthly partitions from first_month up to months_ahead past
+    # the current month (UTC). Also called periodically by the app
+    # (crud/partitions.py), so inserts always find their month's partition.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION tasks_ensure_partitions(parent regclass, first_month date, months_ahead int)
+        RETURNS int
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            month date := date_trunc('month', first_month)::date;
+            last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                                + make_interval(months => months_ahead))::date;
+            partition_name text;
+            created int := 0;
+        BEGIN
+            -- Serialize concurrent callers (one per app worker)
+            PERFORM pg_advisory_xact_lock(hashtext('tasks_ensure_partitions'));
+            WHILE month <= last_month LOOP
+                partition_name := format('tasks_y%sm%s', to_char(month, 'YYYY'), to_char(month, 'MM'));
+                IF to_regclass(partition_name) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, parent,
+                        month::timestamp AT TIME ZONE 'UTC',
+                        (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                    );
+                    created := created + 1;
+                END IF;
+                month := (month + interval '1 month')::date;
+            END LOOP;
+            RETURN created;
+        END
+        $$
+    """)
+
+    # 0. The partition key is read from the stored row by both the mirror
+    # trigger and the copy, so a missing created_at is filled in tasks itself:
+    # by a BEFORE trigger for new writes, in batches for existing rows
+    op.execute("""
+        CREATE OR REPLACE FUNCTION tasks_fill_created_at()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.created_at := coalesce(NEW.created_at, NEW.updated_at, now());
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("DROP TRIGGER IF EXISTS tasks_fill_created_at ON tasks")
+    op.execute("""
+        CREATE TRIGGER tasks_fill_created_at
+        BEFORE INSERT OR UPDATE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_fill_created_at()
+    """)
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        while conn.execute(sa.text("""
+            UPDATE tasks SET created_at = coalesce(updated_at, now())
+            WHERE id IN (SELECT id FROM tasks WHERE created_at IS NULL LIMIT :batch_size)
+        """), {"batch_size": COPY_BATCH_SIZE}).rowcount:
+            time.sleep(COPY_PAUSE_SECONDS)
+
+    # 1. Partitioned copy of tasks; the partition key has to be part of the PK
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tasks_partitioned (
+            id uuid NOT NULL,
+            owner_id uuid NOT NULL,
+            title varchar(255) NOT NULL,
+            description text,
+            status task_status NOT NULL,
+            due_date timestamptz,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz,
+            start_at timestamptz,
+            end_at timestamptz,
+            search_vector tsvector,
+            CONSTRAINT tasks_partitioned_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT tasks_owner_id_fkey FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS task_ids (
+            id uuid NOT NULL,
+            CONSTRAINT task_ids_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION task_ids_on_insert()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            -- No ON CONFLICT: a duplicate id fails the statement (task_ids_pkey)
+            INSERT INTO task_ids (id) SELECT id FROM new_rows;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION task_ids_on_delete()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM task_ids t USING old_rows o WHERE t.id = o.id;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute(f"""
+        SELECT tasks_ensure_partitions(
+            'tasks_partitioned',
+            (coalesce((SELECT min(created_at) FROM tasks), now()) AT TIME ZONE 'UTC')::date,
+            {PARTITION_MONTHS_AHEAD}
+        )
+    """)
+    # Built on the empty parent, so no CONCURRENTLY needed; renamed at the swap
+    for name, columns, options in TASK_INDEXES:
+        op.create_index(f'{name}_p', 'tasks_partitioned', columns, unique=False,
+                        if_not_exists=True, **options)
+
+    # 2. Mirror every write on tasks while the copy runs. Updates are
+    # delete + insert so all columns follow without listing them twice.
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION tasks_mirror_to_partitioned()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM tasks_partitioned WHERE id = OLD.id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM task_ids WHERE id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO tasks_partitioned ({COLUMNS})
+                VALUES ({SOURCE_COLUMNS.format(t='NEW')});
+            END IF;
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO task_ids (id) VALUES (NEW.id) ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("DROP TRIGGER IF EXISTS tasks_mirror ON tasks")
+    op.execute("""
+        CREATE TRIGGER tasks_mirror
+        AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_mirror_to_partitioned()
+    """)
+
+    # 3. Batched copy. FOR SHARE makes a concurrent update/delete wait for (or
+    # be seen by) the batch, so the mirror trigger always has the last word.
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        last_id = '00000000-0000-0000-0000-000000000000'
+        while True:
+            last_id = conn.execute(sa.text(f"""
+                WITH batch AS (
+                    SELECT * FROM tasks
+                    WHERE id > :last_id
+                    ORDER BY id
+                    LIMIT :batch_size
+                    FOR SHARE
+                ), copied AS (
+                    INSERT INTO tasks_partitioned ({COLUMNS})
+                    SELECT {SOURCE_COLUMNS.format(t='batch')} FROM batch
+                    ON CONFLICT DO NOTHING
+                ), registered AS (
+                    INSERT INTO task_ids (id) SELECT id FROM batch
+                    ON CONFLICT DO NOTHING
+                )
+                SELECT id FROM batch ORDER BY id DESC LIMIT 1
+            """), {"last_id": last_id, "batch_size": COPY_BATCH_SIZE}).scalar()
+            if last_id is None:
+                break
+            time.sleep(COPY_PAUSE_SECONDS)
+
+    # 4. Swap: brief ACCESS EXCLUSIVE lock; give up instead of queueing writers
+    op.execute("SET LOCAL lock_timeout = '10s'")
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TABLE tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_mirror_to_partitioned()")
+    op.execute("DROP FUNCTION IF EXISTS tasks_fill_created_at()")
+    op.execute("ALTER TABLE tasks_partitioned RENAME TO tasks")
+    op.execute("ALTER INDEX tasks_partitioned_pkey RENAME TO tasks_pkey")
+    for name, _, _ in TASK_INDEXES:
+        op.execute(f"ALTER INDEX {name}_p RENAME TO {name}")
+    create_task_triggers('tasks')
+    create_task_triggers('tasks', TASK_ID_TRIGGERS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Offline: writes are blocked while the rows are copied back
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    op.execute("""
+        CREATE TABLE tasks_unpartitioned (
+            id uuid NOT NULL,
+            owner_id uuid NOT NULL,
+            title varchar(255) NOT NULL,
+            description text,
+            status task_status NOT NULL,
+            due_date timestamptz,
+            created_at timestamptz,
+            updated_at timestamptz,
+            start_at timestamptz,
+            end_at timestamptz,
+            search_vector tsvector,
+            CONSTRAINT tasks_unpartitioned_pkey PRIMARY KEY (id),
+            CONSTRAINT tasks_owner_id_fkey FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute(f"INSERT INTO tasks_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM tasks")
+    op.execute("DROP TABLE tasks")
+    op.execute("ALTER TABLE tasks_unpartitioned RENAME TO tasks")
+    op.execute("ALTER INDEX tasks_unpartitioned_pkey RENAME TO tasks_pkey")
+    for name, columns, options in TASK_INDEXES:
+        op.create_index(name, 'tasks', columns, unique=False, **options)
+    create_task_triggers('tasks')
+    op.execute("DROP TABLE IF EXISTS task_ids")
+    op.execute("DROP FUNCTION IF EXISTS task_ids_on_delete()")
+    op.execute("DROP FUNCTION IF EXISTS task_ids_on_insert()")
+    op.execute("DROP FUNCTION IF EXISTS tasks_ensure_partitions(regclass, date, int)")
@@ -0,0 +1,72 @@
+"""add task tombstones and updated_at index for delta sync
+
+Revision ID: 1b9c7cc84d81
+Revises: 676fdf56e8f7
+Create Date: 2026-10-18 13:21:07.918254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b9c7cc84d81'
+down_revision: Union[str, Sequence[str], None] = '676fdf56e8f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_tombstones',
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_task_tombstones_owner_deleted_task', 'task_tombstones',
+                    ['owner_id', 'deleted_at', 'task_id'], unique=False)
+
+    # One INSERT per delete statement. Owners removed in the same statement
+    # (user delete cascading to tasks) are skipped: nobody is left to sync.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION task_tombstones_on_delete()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO task_tombstones (task_id, owner_id, deleted_at)
+            SELECT o.id, o.owner_id, now() FROM old_rows o
+            WHERE EXISTS (SELECT 1 FROM users u WHERE u.id = o.owner_id)
+            ON CONFLICT (task_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_tombstone
+        AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_tombstones_on_delete()
+    """)
+
+    # Rows written before updated_at was always set would never show up in a sync
+    op.execute("UPDATE tasks SET updated_at = created_at WHERE updated_at IS NULL")
+
+    # CONCURRENTLY cannot run inside a transaction; avoids blocking writes on tasks
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_owner_updated_id', 'tasks', ['owner_id', 'updated_at', 'id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_owner_updated_id', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS tasks_tombstone ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS task_tombstones_on_delete()")
+    op.drop_index('ix_task_tombstones_owner_deleted_task', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
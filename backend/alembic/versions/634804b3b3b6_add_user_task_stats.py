@@ -0,0 +1,88 @@
+"""add user_task_stats counters
+
+Revision ID: 634804b3b3b6
+Revises: eb11843d828d
+Create Date: 2026-10-18 11:20:55.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '634804b3b3b6'
+down_revision: Union[str, Sequence[str], None] = 'eb11843d828d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_task_stats',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('task_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Statement-level triggers with transition tables: one counter update per
+    # owner per statement, so multi-row inserts/deletes stay cheap
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_task_stats_on_insert()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO user_task_stats (user_id, task_count)
+            SELECT owner_id, count(*) FROM new_rows GROUP BY owner_id
+            ON CONFLICT (user_id)
+            DO UPDATE SET task_count = user_task_stats.task_count + EXCLUDED.task_count;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_task_stats_on_delete()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE user_task_stats s
+            SET task_count = s.task_count - d.removed
+            FROM (SELECT owner_id, count(*) AS removed FROM old_rows GROUP BY owner_id) d
+            WHERE s.user_id = d.owner_id;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_count_insert
+        AFTER INSERT ON tasks
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION user_task_stats_on_insert()
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_count_delete
+        AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION user_task_stats_on_delete()
+    """)
+
+    # CREATE TRIGGER holds SHARE ROW EXCLUSIVE on tasks until commit, so the
+    # seed below cannot race with concurrent inserts/deletes
+    op.execute("""
+        INSERT INTO user_task_stats (user_id, task_count)
+        SELECT u.id, count(t.id)
+        FROM users u
+        LEFT JOIN tasks t ON t.owner_id = u.id
+        GROUP BY u.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS tasks_count_delete ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS tasks_count_insert ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS user_task_stats_on_delete()")
+    op.execute("DROP FUNCTION IF EXISTS user_task_stats_on_insert()")
+    op.drop_table('user_task_stats')
@@ -0,0 +1,106 @@
+"""add per-user task collection version
+
+Revision ID: 676fdf56e8f7
+Revises: 634804b3b3b6
+Create Date: 2026-10-18 12:05:31.442871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '676fdf56e8f7'
+down_revision: Union[str, Sequence[str], None] = '634804b3b3b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_task_stats',
+                  sa.Column('tasks_version', sa.BigInteger(), nullable=False, server_default='0'))
+
+    # Every statement that writes a user's tasks bumps their version once
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_task_stats_on_insert()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO user_task_stats (user_id, task_count, tasks_version)
+            SELECT owner_id, count(*), 1 FROM new_rows GROUP BY owner_id
+            ON CONFLICT (user_id)
+            DO UPDATE SET task_count = user_task_stats.task_count + EXCLUDED.task_count,
+                          tasks_version = user_task_stats.tasks_version + 1;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_task_stats_on_delete()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE user_task_stats s
+            SET task_count = s.task_count - d.removed,
+                tasks_version = s.tasks_version + 1
+            FROM (SELECT owner_id, count(*) AS removed FROM old_rows GROUP BY owner_id) d
+            WHERE s.user_id = d.owner_id;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_task_stats_on_update()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE user_task_stats s
+            SET tasks_version = s.tasks_version + 1
+            FROM (SELECT DISTINCT owner_id FROM new_rows) d
+            WHERE s.user_id = d.owner_id;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_version_update
+        AFTER UPDATE ON tasks
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION user_task_stats_on_update()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS tasks_version_update ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS user_task_stats_on_update()")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_task_stats_on_insert()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO user_task_stats (user_id, task_count)
+            SELECT owner_id, count(*) FROM new_rows GROUP BY owner_id
+            ON CONFLICT (user_id)
+            DO UPDATE SET task_count = user_task_stats.task_count + EXCLUDED.task_count;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_task_stats_on_delete()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE user_task_stats s
+            SET task_count = s.task_count - d.removed
+            FROM (SELECT owner_id, count(*) AS removed FROM old_rows GROUP BY owner_id) d
+            WHERE s.user_id = d.owner_id;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.drop_column('user_task_stats', 'tasks_version')
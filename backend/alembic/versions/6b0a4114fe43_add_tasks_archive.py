@@ -0,0 +1,166 @@
+"""add tasks_archive for completed tasks
+
+Revision ID: 6b0a4114fe43
+Revises: 1251a9ed1a3e
+Create Date: 2026-10-18 17:04:38.217560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b0a4114fe43'
+down_revision: Union[str, Sequence[str], None] = '1251a9ed1a3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ARCHIVE_COLUMNS = ('id, owner_id, title, description, status, due_date, '
+                   'created_at, updated_at, start_at, end_at')
+
+# The archival job (crud/archive.py) deletes from tasks with app.archiving on:
+# an archived task still exists, so it must not be tombstoned or announced
+# as deleted. {guard} is empty on downgrade.
+ARCHIVING_GUARD = """
+        IF current_setting('app.archiving', true) = 'on' THEN
+            RETURN NULL;
+        END IF;"""
+
+TOMBSTONE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION task_tombstones_on_delete()
+    RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN{guard}
+        INSERT INTO task_tombstones (task_id, owner_id, deleted_at)
+        SELECT o.id, o.owner_id, now() FROM old_rows o
+        WHERE EXISTS (SELECT 1 FROM users u WHERE u.id = o.owner_id)
+        ON CONFLICT (task_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+        RETURN NULL;
+    END
+    $$
+"""
+
+NOTIFY_FUNCTION = """
+    CREATE OR REPLACE FUNCTION tasks_notify_changes()
+    RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        change record;
+    BEGIN{guard}
+        FOR change IN
+            SELECT owner_id, count(*) AS changed, array_agg(id) AS ids
+            FROM changed_rows GROUP BY owner_id
+        LOOP
+            PERFORM pg_notify('task_changes', json_build_object(
+                'owner_id', change.owner_id,
+                'type', CASE TG_OP WHEN 'INSERT' THEN 'created'
+                                   WHEN 'UPDATE' THEN 'updated'
+                                   ELSE 'deleted' END,
+                'count', change.changed,
+                'ids', CASE WHEN change.changed <= 100 THEN to_json(change.ids) END
+            )::text);
+        END LOOP;
+        RETURN NULL;
+    END
+    $$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', postgresql.ENUM('todo', 'in_progress', 'completed', name='task_status', create_type=False), nullable=False),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('start_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('end_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_archive_owner_created_covering', 'tasks_archive',
+                    ['owner_id', 'created_at', 'id'], unique=False,
+                    postgresql_include=['status', 'due_date', 'start_at', 'end_at'])
+
+    # Archived tasks still count towards the user's total: moving a batch is
+    # -n on tasks and +n here, so task_count is unchanged
+    op.execute("""
+        CREATE TRIGGER tasks_archive_count_insert
+        AFTER INSERT ON tasks_archive
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION user_task_stats_on_insert()
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_archive_count_delete
+        AFTER DELETE ON tasks_archive
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION user_task_stats_on_delete()
+    """)
+
+    op.execute(TOMBSTONE_FUNCTION.format(guard=ARCHIVING_GUARD))
+    op.execute(NOTIFY_FUNCTION.format(guard=ARCHIVING_GUARD))
+
+    # Hot + cold rows for analytics over old date ranges; quals are pushed
+    # into both branches, so tasks partitions are still pruned
+    op.execute(f"""
+        CREATE VIEW tasks_with_archive AS
+        SELECT {ARCHIVE_COLUMNS} FROM tasks
+        UNION ALL
+        SELECT {ARCHIVE_COLUMNS} FROM tasks_archive
+    """)
+
+    # Archival candidates. CONCURRENTLY is not supported on a partitioned
+    # table: create the parent index ONLY (invalid), build each partition's
+    # index concurrently and attach it; the parent turns valid with the last one
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_completed_updated ON ONLY tasks (updated_at)
+        WHERE status = 'completed'
+    """)
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        partitions = conn.execute(sa.text("""
+            SELECT inhrelid::regclass::text FROM pg_inherits
+            WHERE inhparent = 'tasks'::regclass
+        """)).scalars().all()
+        for partition in partitions:
+            index_name = f'{partition}_completed_updated_idx'
+            conn.execute(sa.text(f"""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {partition} (updated_at)
+                WHERE status = 'completed'
+            """))
+            attached = conn.execute(sa.text("""
+                SELECT 1 FROM pg_inherits
+                WHERE inhrelid = to_regclass(:index_name)
+                AND inhparent = 'ix_tasks_completed_updated'::regclass
+            """), {"index_name": index_name}).scalar()
+            if not attached:
+                conn.execute(sa.text(f"ALTER INDEX ix_tasks_completed_updated ATTACH PARTITION {index_name}"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_tasks_completed_updated")
+    # Put archived rows back so no task is lost; deleting them from the
+    # archive (trigger still on) takes back the count the insert adds
+    op.execute(f"""
+        INSERT INTO tasks ({ARCHIVE_COLUMNS})
+        SELECT {ARCHIVE_COLUMNS} FROM tasks_archive
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("DELETE FROM tasks_archive")
+    op.execute(NOTIFY_FUNCTION.format(guard=''))
+    op.execute(TOMBSTONE_FUNCTION.format(guard=''))
+    op.execute("DROP VIEW IF EXISTS tasks_with_archive")
+    op.execute("DROP TRIGGER IF EXISTS tasks_archive_count_delete ON tasks_archive")
+    op.execute("DROP TRIGGER IF EXISTS tasks_archive_count_insert ON tasks_archive")
+    op.drop_index('ix_tasks_archive_owner_created_covering', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
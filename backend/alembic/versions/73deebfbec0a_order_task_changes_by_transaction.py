@@ -0,0 +1,123 @@
+"""order task changes by writing transaction (xid8) for delta sync
+
+Revision ID: 73deebfbec0a
+Revises: 6b0a4114fe43
+Create Date: 2026-10-18 19:12:44.502917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '73deebfbec0a'
+down_revision: Union[str, Sequence[str], None] = '6b0a4114fe43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# updated_at comes from the app clock before commit and deleted_at from
+# now(), so neither orders changes by when they became visible. Rows now
+# carry the id of the transaction that last wrote them; GET /tasks/changes
+# only returns ids below the reader's snapshot xmin (all committed or gone).
+# Existing rows get 0: older than any snapshot.
+
+TOMBSTONE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION task_tombstones_on_delete()
+    RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF current_setting('app.archiving', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        INSERT INTO task_tombstones (task_id, owner_id, deleted_at{xid_column})
+        SELECT o.id, o.owner_id, now(){xid_value} FROM old_rows o
+        WHERE EXISTS (SELECT 1 FROM users u WHERE u.id = o.owner_id)
+        ON CONFLICT (task_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at{xid_update};
+        RETURN NULL;
+    END
+    $$
+"""
+
+
+def tombstone_function(with_xid: bool) -> str:
+    if not with_xid:
+        return TOMBSTONE_FUNCTION.format(xid_column='', xid_value='', xid_update='')
+    return TOMBSTONE_FUNCTION.format(
+        xid_column=', change_xid',
+        xid_value=', pg_current_xact_id()',
+        xid_update=', change_xid = EXCLUDED.change_xid',
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant defaults: catalog-only changes, no table rewrite
+    op.execute("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS change_xid xid8 NOT NULL DEFAULT '0'")
+    op.execute("ALTER TABLE task_tombstones ADD COLUMN IF NOT EXISTS change_xid xid8 NOT NULL DEFAULT '0'")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION tasks_set_change_xid()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id();
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("DROP TRIGGER IF EXISTS tasks_set_change_xid ON tasks")
+    op.execute("""
+        CREATE TRIGGER tasks_set_change_xid
+        BEFORE INSERT OR UPDATE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_set_change_xid()
+    """)
+    op.execute(tombstone_function(with_xid=True))
+
+    # Same ONLY + per-partition CONCURRENTLY + ATTACH build as
+    # ix_tasks_completed_updated; new partitions get the index on creation
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tasks_owner_xid_id ON ONLY tasks (owner_id, change_xid, id)")
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        partitions = conn.execute(sa.text("""
+            SELECT inhrelid::regclass::text FROM pg_inherits
+            WHERE inhparent = 'tasks'::regclass
+        """)).scalars().all()
+        for partition in partitions:
+            index_name = f'{partition}_owner_xid_id_idx'
+            conn.execute(sa.text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {partition} (owner_id, change_xid, id)"
+            ))
+            attached = conn.execute(sa.text("""
+                SELECT 1 FROM pg_inherits
+                WHERE inhrelid = to_regclass(:index_name)
+                AND inhparent = 'ix_tasks_owner_xid_id'::regclass
+            """), {"index_name": index_name}).scalar()
+            if not attached:
+                conn.execute(sa.text(f"ALTER INDEX ix_tasks_owner_xid_id ATTACH PARTITION {index_name}"))
+
+        op.create_index('ix_task_tombstones_owner_xid_task', 'task_tombstones',
+                        ['owner_id', 'change_xid', 'task_id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_task_tombstones_owner_deleted_task', table_name='task_tombstones',
+                      postgresql_concurrently=True, if_exists=True)
+
+    # No longer read by the changes feed (dropping the parent drops the partitions' indexes)
+    op.execute("DROP INDEX IF EXISTS ix_tasks_owner_updated_id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_tasks_owner_updated_id', 'tasks', ['owner_id', 'updated_at', 'id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_task_tombstones_owner_deleted_task', 'task_tombstones',
+                    ['owner_id', 'deleted_at', 'task_id'], unique=False, if_not_exists=True)
+    op.execute("DROP INDEX IF EXISTS ix_task_tombstones_owner_xid_task")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_owner_xid_id")
+    op.execute(tombstone_function(with_xid=False))
+    op.execute("DROP TRIGGER IF EXISTS tasks_set_change_xid ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_set_change_xid()")
+    op.execute("ALTER TABLE task_tombstones DROP COLUMN IF EXISTS change_xid")
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS change_xid")
@@ -0,0 +1,70 @@
+"""notify task changes per owner with pg_notify
+
+Revision ID: 94e3a155bdc9
+Revises: 4577126bb79d
+Create Date: 2026-10-18 15:30:52.661409
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '94e3a155bdc9'
+down_revision: Union[str, Sequence[str], None] = '4577126bb79d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (trigger, event, transition table kind); a trigger with a transition table
+# may only have one event, so the shared function gets three triggers
+NOTIFY_TRIGGERS = [
+    ('tasks_notify_insert', 'INSERT', 'NEW'),
+    ('tasks_notify_update', 'UPDATE', 'NEW'),
+    ('tasks_notify_delete', 'DELETE', 'OLD'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One notification per owner per statement, delivered on commit. Large
+    # statements (bulk/import) send only the count: payloads are capped at 8kB
+    op.execute("""
+        CREATE OR REPLACE FUNCTION tasks_notify_changes()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            change record;
+        BEGIN
+            FOR change IN
+                SELECT owner_id, count(*) AS changed, array_agg(id) AS ids
+                FROM changed_rows GROUP BY owner_id
+            LOOP
+                PERFORM pg_notify('task_changes', json_build_object(
+                    'owner_id', change.owner_id,
+                    'type', CASE TG_OP WHEN 'INSERT' THEN 'created'
+                                       WHEN 'UPDATE' THEN 'updated'
+                                       ELSE 'deleted' END,
+                    'count', change.changed,
+                    'ids', CASE WHEN change.changed <= 100 THEN to_json(change.ids) END
+                )::text);
+            END LOOP;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for name, event, kind in NOTIFY_TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER {event} ON tasks
+            REFERENCING {kind} TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION tasks_notify_changes()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in NOTIFY_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_notify_changes()")
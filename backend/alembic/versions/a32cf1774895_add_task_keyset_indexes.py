@@ -0,0 +1,43 @@
+"""add task keyset pagination indexes
+
+Revision ID: a32cf1774895
+Revises: 30fcd5401670
+Create Date: 2026-10-18 10:02:17.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a32cf1774895'
+down_revision: Union[str, Sequence[str], None] = '30fcd5401670'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, columns) backing each GET /tasks sort
+KEYSET_INDEXES = [
+    ('ix_tasks_owner_created_id', ['owner_id', 'created_at', 'id']),
+    ('ix_tasks_owner_due_id', ['owner_id', 'due_date', 'id']),
+    ('ix_tasks_owner_title_id', ['owner_id', 'title', 'id']),
+    ('ix_tasks_owner_status_id', ['owner_id', 'status', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction; avoids blocking writes on tasks
+    with op.get_context().autocommit_block():
+        for name, columns in KEYSET_INDEXES:
+            op.create_index(name, 'tasks', columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(KEYSET_INDEXES):
+            op.drop_index(name, table_name='tasks',
+                          postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,56 @@
+"""notify principal changes so every worker drops its cached copy
+
+Revision ID: c412c1aa586c
+Revises: 73deebfbec0a
+Create Date: 2026-10-18 19:48:21.630148
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c412c1aa586c'
+down_revision: Union[str, Sequence[str], None] = '73deebfbec0a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (trigger, table, events, user id column): everything a cached Principal
+# or token version is read from
+PRINCIPAL_TRIGGERS = [
+    ('users_notify_principal', 'users', 'UPDATE OR DELETE', 'id'),
+    ('subscriptions_notify_principal', 'subscriptions', 'INSERT OR UPDATE OR DELETE', 'user_id'),
+    ('token_versions_notify_principal', 'token_versions', 'INSERT OR UPDATE OR DELETE', 'user_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Payload is the user id; delivered on commit and deduplicated per
+    # transaction, so a multi-row change sends one notification per user
+    op.execute("""
+        CREATE OR REPLACE FUNCTION principal_notify_change()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('principal_changes',
+                              coalesce(to_jsonb(NEW), to_jsonb(OLD)) ->> TG_ARGV[0]);
+            RETURN NULL;
+        END
+        $$
+    """)
+    for name, table, events, column in PRINCIPAL_TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER {events} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION principal_notify_change('{column}')
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in PRINCIPAL_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS principal_notify_change()")
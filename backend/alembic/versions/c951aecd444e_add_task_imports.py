@@ -0,0 +1,62 @@
+"""add task import tracking and staging tables
+
+Revision ID: c951aecd444e
+Revises: 1b9c7cc84d81
+Create Date: 2026-10-18 14:02:44.310925
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c951aecd444e'
+down_revision: Union[str, Sequence[str], None] = '1b9c7cc84d81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_imports',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('format', sa.String(length=16), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('task_limit', sa.Integer(), nullable=True),
+    sa.Column('total_rows', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('valid_rows', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('invalid_rows', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('merged_through', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('imported_rows', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('skipped_rows', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('errors', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default='[]'),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_imports_owner_created', 'task_imports', ['owner_id', 'created_at'], unique=False)
+    op.create_table('task_import_rows',
+    sa.Column('import_id', sa.UUID(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('row_number', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['import_id'], ['task_imports.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('import_id', 'seq')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_import_rows')
+    op.drop_index('ix_task_imports_owner_created', table_name='task_imports')
+    op.drop_table('task_imports')
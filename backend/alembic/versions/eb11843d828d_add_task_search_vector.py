@@ -0,0 +1,85 @@
+"""add task full-text search vector
+
+Revision ID: eb11843d828d
+Revises: a32cf1774895
+Create Date: 2026-10-18 10:48:03.271560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eb11843d828d'
+down_revision: Union[str, Sequence[str], None] = 'a32cf1774895'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable column without default: catalog-only change, no table rewrite
+    op.add_column('tasks', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Single definition shared by the trigger and the backfill (title ranks above description)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION tasks_search_vector(title text, description text)
+        RETURNS tsvector
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION tasks_search_vector_update()
+        RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := tasks_search_vector(NEW.title, NEW.description);
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, description ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update()
+    """)
+
+    # Backfill existing rows in short, separately committed batches so
+    # row locks are held briefly and concurrent writers are never blocked
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        while True:
+            result = conn.execute(sa.text("""
+                UPDATE tasks
+                SET search_vector = tasks_search_vector(title, description)
+                WHERE id IN (
+                    SELECT id FROM tasks
+                    WHERE search_vector IS NULL
+                    LIMIT :batch_size
+                    FOR UPDATE SKIP LOCKED
+                )
+            """), {"batch_size": BACKFILL_BATCH_SIZE})
+            if result.rowcount == 0:
+                break
+
+        op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], unique=False,
+                        postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_search_vector', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS tasks_search_vector_update ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_search_vector_update()")
+    op.execute("DROP FUNCTION IF EXISTS tasks_search_vector(text, text)")
+    op.drop_column('tasks', 'search_vector')
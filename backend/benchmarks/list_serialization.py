@@ -0,0 +1,110 @@
+"""
+Microbenchmark: ORM + response_model list path vs. column-projected rows.
+
+Both paths start from the same driver tuples, so database time is excluded
+and only what happens in the worker is measured:
+
+  orm   - hydrate Task entities in a Session (identity map, instrumentation),
+          validate them into a TaskResponse page with from_attributes, dump JSON
+  rows  - Core rows for TASK_RESPONSE_COLUMNS -> dicts -> JSON bytes
+
+    python -m benchmarks.list_serialization --rows 5000 --repeat 20
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from crud.tasks import TASK_RESPONSE_COLUMNS
+from enums.task_status import TaskStatus
+from models.task import Task
+from schemas.task import TaskResponse
+from utils.serialize import dump_json
+
+COLUMN_NAMES = [column.key for column in TASK_RESPONSE_COLUMNS]
+
+
+class OrmPage(BaseModel):
+    """The list response_model before the projected path (full TaskResponse items)"""
+    items: list[TaskResponse]
+    next_cursor: str | None = None
+
+
+class _Row(tuple):
+    """Stand-in for a Core Row: tuple with ._mapping, as rows_to_dicts expects"""
+
+    @property
+    def _mapping(self):
+        return dict(zip(COLUMN_NAMES, self))
+
+
+def make_rows(count: int):
+    now = datetime.now(timezone.utc)
+    statuses = list(TaskStatus)
+    return [
+        (
+            uuid.uuid4(),
+            f"Task {i}",
+            "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+            now + timedelta(days=i % 30),
+            statuses[i % len(statuses)],
+            now - timedelta(minutes=i),
+            now,
+            now - timedelta(hours=2) if i % 3 else None,
+            now - timedelta(hours=1) if i % 3 == 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def orm_path(rows) -> bytes:
+    owner_id = uuid.uuid4()
+    with Session() as session:
+        tasks = []
+        for row in rows:
+            task = Task(owner_id=owner_id, **dict(zip(COLUMN_NAMES, row)))
+            session.add(task)
+            tasks.append(task)
+        page = OrmPage.model_validate({"items": tasks, "next_cursor": None}, from_attributes=True)
+        return page.model_dump_json().encode()
+
+
+def rows_path(rows) -> bytes:
+    items = [dict(_Row(row)._mapping) for row in rows]
+    return dump_json({"items": items, "next_cursor": None})
+
+
+def measure(fn, rows, repeat: int):
+    fn(rows)  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn(rows)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare task list serialization paths")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    orm_ms, orm_bytes = measure(orm_path, rows, args.repeat)
+    rows_ms, rows_bytes = measure(rows_path, rows, args.repeat)
+
+    print(f"{args.rows} rows, median of {args.repeat} runs")
+    print(f"  orm + response_model : {orm_ms:8.2f} ms  ({orm_bytes} bytes)")
+    print(f"  column rows -> bytes : {rows_ms:8.2f} ms  ({rows_bytes} bytes)")
+    print(f"  speedup              : {orm_ms / rows_ms:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,56 @@ class Settings(BaseSettings):
     SECRET_KEY: str  
     ALGORITHM: ClassVar[str] = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 2  # 2 days
+    ACCESS_TOKEN_REFRESH_WINDOW_MINUTES: int = 60 * 12  # /auth/me re-issues inside this window
+
+    # Principal cache (per worker). Changes are pushed to every worker over
+    # pg_notify; the TTLs only bound staleness while that connection is down
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = 30
+
+    # Password hashing (bcrypt process pool, per worker)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Subscription limits
+    FREE_TIER_TASK_LIMIT: int = 10
+
+    # Bulk task endpoints
+    TASK_BULK_MAX_ITEMS: int = 500
+
+    # Bulk task import (merged in the background, chunk by chunk)
+    TASK_IMPORT_STAGE_CHUNK_SIZE: int = 5000
+    TASK_IMPORT_MERGE_CHUNK_SIZE: int = 2000
+    TASK_IMPORT_THROTTLE_SECONDS: float = 0.1  # pause between merge chunks
+    TASK_IMPORT_MAX_CONCURRENCY: int = 1  # merges running at once, per worker
+    TASK_IMPORT_MAX_ERRORS: int = 1000  # row errors kept per import
+
+    # Task change stream (SSE, fed by one LISTEN connection per worker)
+    TASK_STREAM_QUEUE_SIZE: int = 100  # events buffered per subscriber
+    TASK_STREAM_HEARTBEAT_SECONDS: int = 15
+    TASK_STREAM_MAX_PER_USER: int = 5
+
+    # Monthly tasks partitions (created ahead by a periodic job per worker)
+    TASK_PARTITION_MONTHS_AHEAD: int = 3
+    TASK_PARTITION_CHECK_SECONDS: int = 6 * 60 * 60
+
+    # Archival of completed tasks into tasks_archive (periodic job, one worker at a time)
+    TASK_ARCHIVE_AFTER_DAYS: int = 90  # completed and untouched for this long
+    TASK_ARCHIVE_BATCH_SIZE: int = 1000
+    TASK_ARCHIVE_PAUSE_SECONDS: float = 0.1
+    TASK_ARCHIVE_INTERVAL_SECONDS: int = 60 * 60
+
+    # Task export (rows fetched per server-side cursor round trip)
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Admin API (disabled unless a key is configured)
+    ADMIN_API_KEY: str | None = None
+
+    # Bulk user provisioning
+    PROVISION_HASH_WORKERS: int = 4
+    PROVISION_CHUNK_SIZE: int = 1000
 
     # Server
     APP_PORT: int = 8000  
@@ -34,6 +84,33 @@ class Settings(BaseSettings):
     PG_PASSWORD : str
     PG_DB : str
 
+    # Read replica (optional): read-only endpoints use it when configured
+    PG_REPLICA_HOST: str | None = None
+    PG_REPLICA_PORT: int | None = None  # defaults to PG_PORT
+
+    # Connection pools, per worker and per workload (config/database.py).
+    # A worker opens at most the sum of size + overflow over all pools
+    # (the replica pool uses the CRUD sizes): keep workers x that under
+    # max_connections, or under PgBouncer's pool size
+    DB_CRUD_POOL_SIZE: int = 10
+    DB_CRUD_MAX_OVERFLOW: int = 10
+    DB_AUTH_POOL_SIZE: int = 5  # login and registration
+    DB_AUTH_MAX_OVERFLOW: int = 5
+    DB_ANALYTICS_POOL_SIZE: int = 3  # exports and background jobs (imports, archival)
+    DB_ANALYTICS_MAX_OVERFLOW: int = 2
+    DB_POOL_TIMEOUT_SECONDS: float = 30  # wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 3600
+    # Statement reuse (config/statements.py). Prepared statements are kept per
+    # pooled connection, compiled SQL per engine; size them above the number
+    # of distinct hot queries so steady-state requests never re-prepare
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256  # SQLAlchemy asyncpg adapter, per connection
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg's own cache (raw connection use)
+    DB_COMPILED_CACHE_SIZE: int = 1000  # SQLAlchemy query_cache_size, per engine
+    # PgBouncer in transaction pooling mode: no named server-side prepared
+    # statements and no startup parameters. The task stream LISTEN
+    # connection needs session pooling or a direct PG_HOST.
+    PGBOUNCER: bool = False
+
     @property
     def SQLALCHEMY_DATABASE_URL(self) -> str:
         """Async SQLAlchemy URL for asyncpg"""
@@ -42,6 +119,16 @@ class Settings(BaseSettings):
             f"@{self.PG_HOST}:{self.PG_PORT}/{self.PG_DB}"
         )
 
+    @property
+    def SQLALCHEMY_REPLICA_URL(self) -> str | None:
+        """Async SQLAlchemy URL for the read replica, None without one"""
+        if not self.PG_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.PG_USER}:{self.PG_PASSWORD}"
+            f"@{self.PG_REPLICA_HOST}:{self.PG_REPLICA_PORT or self.PG_PORT}/{self.PG_DB}"
+        )
+
     # Load environment variables from .env file
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
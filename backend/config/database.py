@@ -1,35 +1,150 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import Text, cast, event, func, select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from config.api import settings
+from config.pools import InstrumentedPool, PoolTelemetry, pool_stats
+from config.statements import StatementTelemetry, statement_stats
+
+logger = logging.getLogger(__name__)
+
+
+def _create_engine(name: str, url: str, pool_size: int, max_overflow: int, **server_settings):
+    """One pooled engine per workload, so a burst in one cannot starve the others"""
+    statements = StatementTelemetry(name, pgbouncer=settings.PGBOUNCER)
+    connect_args = {
+        "timeout": 30,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "prepared_statement_name_func": statements.prepared_statement_name,
+    }
+    if settings.PGBOUNCER:
+        # Transaction pooling hands each transaction to any server connection:
+        # statements must not outlive it, and startup parameters are rejected
+        connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+    elif server_settings:
+        connect_args["server_settings"] = server_settings
 
+    engine = create_async_engine(
+        url,
+        echo=(settings.APP_ENV == "development"),  # SQL logs only in dev
+        poolclass=InstrumentedPool,
+        pool_pre_ping=True,        # test connections before using
+        pool_size=pool_size,
+        max_overflow=max_overflow,  # extra connections beyond pool_size
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        query_cache_size=settings.DB_COMPILED_CACHE_SIZE,
+        connect_args=connect_args,
+        future=True,               # ensure SQLAlchemy 2.0 style
+    )
+    engine.pool.telemetry = PoolTelemetry(name)
+    statements.attach(engine)
+    engines[name] = (engine, statements)
+    return engine
 
-# Create async engine with connection pooling
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URL,
-    echo=(settings.APP_ENV == "development"),  # SQL logs only in dev
-    pool_pre_ping=True,        # test connections before using
-    pool_size=20,              # default pool size
-    max_overflow=10,           # extra connections beyond pool_size
-    pool_recycle=3600,         # recycle connections every hour
-    connect_args={"timeout": 30},
-    future=True,               # ensure SQLAlchemy 2.0 style
+
+# (engine, StatementTelemetry) by workload name, for /metrics
+engines = {}
+
+# Request CRUD (get_db)
+engine = _create_engine(
+    "crud", settings.SQLALCHEMY_DATABASE_URL,
+    settings.DB_CRUD_POOL_SIZE, settings.DB_CRUD_MAX_OVERFLOW,
 )
 
+# Login and registration (get_auth_db): bcrypt-bound
+# requests keep serving while CRUD is saturated
+auth_engine = _create_engine(
+    "auth", settings.SQLALCHEMY_DATABASE_URL,
+    settings.DB_AUTH_POOL_SIZE, settings.DB_AUTH_MAX_OVERFLOW,
+)
 
-# Async session factory
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    autoflush=False,
-    autocommit=False,
-    expire_on_commit=False,
+# Long-running work: streamed exports and background jobs
+analytics_engine = _create_engine(
+    "analytics", settings.SQLALCHEMY_DATABASE_URL,
+    settings.DB_ANALYTICS_POOL_SIZE, settings.DB_ANALYTICS_MAX_OVERFLOW,
 )
 
+# Optional streaming replica for read-only endpoints. Its sessions refuse
+# writes, so a route wired to the wrong dependency fails loudly.
+replica_engine = None
+if settings.SQLALCHEMY_REPLICA_URL:
+    replica_engine = _create_engine(
+        "replica", settings.SQLALCHEMY_REPLICA_URL,
+        settings.DB_CRUD_POOL_SIZE, settings.DB_CRUD_MAX_OVERFLOW,
+        default_transaction_read_only="on",
+    )
+
+
+class PrimarySession(Session):
+    """Session on the primary; flags the request when it commits a write"""
+
+
+def _session_factory(bind, **kwargs):
+    return sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        autoflush=False,
+        autocommit=False,
+        expire_on_commit=False,
+        **kwargs,
+    )
+
+
+# Async session factory
+AsyncSessionLocal = _session_factory(engine, sync_session_class=PrimarySession)
+
+AuthSessionLocal = _session_factory(auth_engine)
+
+AnalyticsSessionLocal = _session_factory(analytics_engine)
+
+# Read-only session factory (the primary when no replica is configured)
+ReadSessionLocal = _session_factory(replica_engine or engine)
+
 # Base class for models
 Base = declarative_base()
 
 
+# Set to a dict for each request by the read-your-writes middleware
+# (server.py). A committed write marks it, and the response then hands the
+# client the primary's WAL position to send back with its next reads.
+request_writes: ContextVar[dict | None] = ContextVar("request_writes", default=None)
+
+CURRENT_WAL_LSN_QUERY = select(cast(func.pg_current_wal_lsn(), Text))
+
+REPLAYED_QUERY = text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)")
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flushed(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _executed(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _committed(session):
+    writes = request_writes.get()
+    if session.info.pop("wrote", False) and writes is not None:
+        writes["committed"] = True
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("wrote", None)
+
+
 async def get_db():
     """
     Yield a database session for dependency injection.
@@ -39,4 +154,90 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_auth_db():
+    """get_db on the auth pool"""
+    async with AuthSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def advisory_lock(name: str):
+    """
+    Hold a session-level advisory lock on `name` for the block, so a job runs
+    on one worker at a time. Yields the connection holding the lock (use it
+    for the job's own transactions), or None when another worker has it.
+    Session locks need a direct connection or PgBouncer session pooling.
+    """
+    key = func.hashtext(name)
+    async with analytics_engine.connect() as conn:
+        locked = (await conn.execute(select(func.pg_try_advisory_lock(key)))).scalar_one()
+        await conn.commit()
+        if not locked:
+            yield None
+            return
+        try:
+            yield conn
+        finally:
+            try:
+                await conn.rollback()
+                await conn.execute(select(func.pg_advisory_unlock(key)))
+                await conn.commit()
+            except Exception as e:
+                # A broken connection is discarded, which releases the lock too
+                logger.warning(f"Failed to release advisory lock '{name}': {str(e)}")
+
+
+def all_pool_stats():
+    return {name: pool_stats(pool_engine) for name, (pool_engine, _) in engines.items()}
+
+
+def all_statement_stats():
+    return {
+        name: statement_stats(pool_engine, statements)
+        for name, (pool_engine, statements) in engines.items()
+    }
+
+
+async def current_wal_lsn() -> str:
+    """The primary's WAL position; covers every commit that has returned"""
+    async with engine.connect() as conn:
+        return (await conn.execute(CURRENT_WAL_LSN_QUERY)).scalar_one()
+
+
+async def replica_lags(min_lsn: str | None) -> bool:
+    """
+    True when the replica has not replayed WAL up to `min_lsn` (the client's
+    last write, from its read marker) or cannot tell: read from the primary.
+    """
+    if replica_engine is None or min_lsn is None:
+        return False
+    try:
+        async with replica_engine.connect() as conn:
+            return not (await conn.execute(REPLAYED_QUERY, {"lsn": min_lsn})).scalar()
+    except (OSError, asyncio.TimeoutError, DBAPIError) as e:
+        logger.warning(f"Could not check read replica lag: {str(e)}")
+        return True
+
+
+async def open_read_session(min_lsn: str | None = None) -> AsyncSession:
+    """
+    Session for read-only work: the replica, unless it has not replayed the
+    client's writes up to `min_lsn` yet or cannot be reached (then the primary).
+    """
+    if replica_engine is None or await replica_lags(min_lsn):
+        return AsyncSessionLocal()
+
+    session = ReadSessionLocal()
+    try:
+        await session.connection()
+        return session
+    except (OSError, asyncio.TimeoutError, DBAPIError) as e:
+        await session.close()
+        logger.warning(f"Read replica unavailable, reading from the primary: {str(e)}")
+        return AsyncSessionLocal()
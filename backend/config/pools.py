@@ -0,0 +1,73 @@
+import time
+import threading
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolTelemetry:
+    """Checkout counters for one named connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times every checkout (including the connect
+    when the pool grows into overflow) and counts pool timeouts.
+    """
+
+    telemetry: PoolTelemetry | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.telemetry is not None:
+                self.telemetry.record(time.perf_counter() - started, timed_out)
+
+    def recreate(self):
+        # dispose()/invalidation replace the pool: keep counting on the same telemetry
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Current occupancy plus checkout counters for an engine's pool"""
+    pool = engine.pool
+    telemetry = pool.telemetry
+    attempts = telemetry.checkouts + telemetry.timeouts
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": telemetry.checkouts,
+        "timeouts": telemetry.timeouts,
+        "wait_ms_avg": round(telemetry.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0,
+        "wait_ms_max": round(telemetry.wait_seconds_max * 1000, 3),
+    }
@@ -0,0 +1,86 @@
+import threading
+import uuid
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+
+class StatementTelemetry:
+    """
+    Statement reuse counters for one engine:
+
+      compiled cache - SQLAlchemy's per-engine cache of compiled SQL, by
+                       statement structure (hit: no Python-side compile)
+      prepared       - the asyncpg adapter's per-connection prepared
+                       statement cache (a prepare is a Parse on the server)
+
+    In steady state both hit rates should sit at ~1.0: every hot query is
+    compiled once per worker and prepared once per pooled connection.
+    Under PGBOUNCER the prepared statement cache is off (each execution
+    prepares under a fresh name), so it is reported as disabled instead.
+    """
+
+    def __init__(self, name: str, pgbouncer: bool = False):
+        self.name = name
+        self.pgbouncer = pgbouncer
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.compiled_hits = 0
+        self.compiled_misses = 0
+        self.uncached = 0
+        self.prepares = 0
+
+    def prepared_statement_name(self) -> str | None:
+        """
+        prepared_statement_name_func for the asyncpg dialect, called once per
+        prepare, i.e. per miss in the connection's statement cache
+        """
+        with self._lock:
+            self.prepares += 1
+        if self.pgbouncer:
+            # Names must be unique across the server connections PgBouncer shares
+            return f"__asyncpg_{uuid.uuid4()}__"
+        return None  # asyncpg picks the name
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            return  # executemany bypasses the prepared statement cache
+        with self._lock:
+            self.executions += 1
+            if context.cache_hit is CACHE_HIT:
+                self.compiled_hits += 1
+            elif context.cache_hit is CACHE_MISS:
+                self.compiled_misses += 1
+            else:
+                self.uncached += 1
+
+    def attach(self, engine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+def statement_stats(engine, telemetry: StatementTelemetry) -> Dict[str, Any]:
+    compiled_cache = engine.sync_engine._compiled_cache
+    compiled = telemetry.compiled_hits + telemetry.compiled_misses
+    executions = telemetry.executions
+    if telemetry.pgbouncer:
+        # No cache to hit: a hit rate here would only ever read 0
+        prepared = {"enabled": False, "prepares": telemetry.prepares}
+    else:
+        prepared = {
+            "enabled": True,
+            "prepares": telemetry.prepares,
+            "hit_rate": round(max(0, executions - telemetry.prepares) / executions, 4) if executions else 0.0,
+        }
+    return {
+        "executions": executions,
+        "compiled_cache": {
+            "size": len(compiled_cache) if compiled_cache is not None else 0,
+            "max_size": compiled_cache.capacity if compiled_cache is not None else 0,
+            "hits": telemetry.compiled_hits,
+            "misses": telemetry.compiled_misses,
+            "uncached": telemetry.uncached,
+            "hit_rate": round(telemetry.compiled_hits / compiled, 4) if compiled else 0.0,
+        },
+        "prepared_statements": prepared,
+    }
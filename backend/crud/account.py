@@ -3,7 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from models.user import User
-from Security.deps import verify_password, get_password_hash
+from Security.deps import password_hasher
+from Security.cache import invalidate_principal
+from Security.revocation import token_versions
 
 async def update_user_profile(db: AsyncSession, user_id: str, fullname: str = None, email: str = None):
     result = await db.execute(select(User).where(User.id == user_id))
@@ -17,6 +19,7 @@ async def update_user_profile(db: AsyncSession, user_id: str, fullname: str = No
         user.email = email
 
     await db.commit()
+    invalidate_principal(user_id)
     await db.refresh(user)
     return user
 
@@ -27,9 +30,12 @@ async def change_password(db: AsyncSession, user_id: str, old_password: str, new
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not verify_password(old_password, user.hashed_password):
+    if not await password_hasher.verify(old_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Old password is incorrect")
 
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await password_hasher.hash(new_password)
+    version = await token_versions.bump(db, user_id)
     await db.commit()
+    invalidate_principal(user_id)
+    token_versions.remember(user_id, version)
     return {"message": "Password updated successfully"}
\ No newline at end of file
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from config.api import settings
+from config.database import advisory_lock
+from enums.task_status import TaskStatus
+from models.task import Task
+from models.task_archive import TaskArchive
+
+ARCHIVED_COLUMNS = [
+    "id", "owner_id", "title", "description", "status", "due_date",
+    "created_at", "updated_at", "start_at", "end_at",
+]
+
+
+async def archive_batch(db, cutoff: datetime, batch_size: int) -> int:
+    """
+    Move one batch of completed tasks last updated before `cutoff` into
+    tasks_archive with a single DELETE ... RETURNING -> INSERT statement.
+    SKIP LOCKED leaves rows a user is editing for the next run.
+    app.archiving makes the tombstone and notify triggers skip the delete:
+    an archived task still exists, so sync clients must not drop it.
+    """
+    await db.execute(text("SET LOCAL app.archiving = 'on'"))
+    candidates = (
+        select(Task.id, Task.created_at)
+        .where(Task.status == TaskStatus.completed, Task.updated_at < cutoff)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(Task)
+        .where(tuple_(Task.id, Task.created_at).in_(candidates))
+        .returning(*(getattr(Task, column) for column in ARCHIVED_COLUMNS))
+        .cte("moved")
+    )
+    archived = (
+        insert(TaskArchive)
+        .from_select(ARCHIVED_COLUMNS, select(*(moved.c[column] for column in ARCHIVED_COLUMNS)))
+        .returning(TaskArchive.id)
+        .cte("archived")
+    )
+    result = await db.execute(select(func.count()).select_from(archived))
+    count = result.scalar_one()
+    await db.commit()
+    return count
+
+
+async def archive_completed_tasks() -> int:
+    """
+    Periodic job: archive completed tasks older than TASK_ARCHIVE_AFTER_DAYS
+    in short batches, pausing between them. Runs on one worker at a time;
+    returns how many were moved.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS)
+    total = 0
+    async with advisory_lock("task archival") as conn:
+        if conn is None:
+            return 0  # running on another worker
+        while True:
+            async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+                moved = await archive_batch(session, cutoff, settings.TASK_ARCHIVE_BATCH_SIZE)
+            total += moved
+            if moved < settings.TASK_ARCHIVE_BATCH_SIZE:
+                return total
+            await asyncio.sleep(settings.TASK_ARCHIVE_PAUSE_SECONDS)
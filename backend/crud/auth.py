@@ -1,63 +1,141 @@
 import uuid
+from datetime import datetime
+from fastapi import HTTPException
 from models.user import User
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from schemas.user import UserCreate
-from Security.deps import get_password_hash, verify_password
+from schemas.user import UserCreate, Principal
+from Security.deps import password_hasher
 
 
-from sqlalchemy.exc import SQLAlchemyError
-from models.user import User
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.dialects.postgresql import UUID
 from models.subscription import Subscription
+from models.token_version import TokenVersion
 from sqlalchemy.future import select
+from sqlalchemy import bindparam, func, insert, literal, DateTime
+
+
 
+USER_BY_EMAIL_QUERY = select(User).filter(User.email == bindparam("email"))
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     """Fetch user by email"""
-    result = await db.execute(select(User).filter(User.email == email))
+    result = await db.execute(USER_BY_EMAIL_QUERY, {"email": email})
     return result.scalars().first()
 
 
 
-async def create_user_with_subscription(db: AsyncSession, user: UserCreate) -> User:
-    """Create a new user and automatically assign a free subscription"""
-    try:
-        db_user = User(
+async def create_user_with_subscription(db: AsyncSession, user: UserCreate):
+    """
+    Create a new user and automatically assign a free subscription.
+    Both inserts run as one statement (data-modifying CTE); duplicate emails
+    surface as a unique violation on ix_users_email instead of a pre-select.
+    """
+    hashed_password = await password_hasher.hash(user.password)
+    now = datetime.utcnow()
+
+    new_user = (
+        insert(User)
+        .values(
             id=uuid.uuid4(),
             email=user.email,
             fullname=user.fullname,
-            hashed_password=get_password_hash(user.password),
+            hashed_password=hashed_password,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
         )
-        db.add(db_user)
-        await db.flush()  # ensures db_user.id is available
-
-        subscription = Subscription(user_id=db_user.id, tier="free")
-        db.add(subscription)
+        .returning(User.id, User.email, User.fullname, User.is_active, User.created_at)
+        .cte("new_user")
+    )
+    new_subscription = (
+        insert(Subscription)
+        .from_select(
+            ["id", "user_id", "tier", "created_at", "updated_at"],
+            select(
+                literal(uuid.uuid4(), UUID(as_uuid=True)),
+                new_user.c.id,
+                literal("free"),
+                literal(now, DateTime(timezone=True)),
+                literal(now, DateTime(timezone=True)),
+            ),
+        )
+        .returning(Subscription.id)
+        .cte("new_subscription")
+    )
 
+    try:
+        result = await db.execute(select(new_user).add_cte(new_subscription))
+        db_user = result.one()
         await db.commit()
-        await db.refresh(db_user)
         return db_user
 
+    except IntegrityError as e:
+        await db.rollback()
+        if is_unique_violation(e, "ix_users_email"):
+            raise HTTPException(status_code=400, detail="Email already registered")
+        raise
     except SQLAlchemyError:
         await db.rollback()
         raise
 
 
-async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
-    result = await db.execute(select(User).filter(User.email == email))
-    user = result.scalars().first()
-    if not user:
+def is_unique_violation(exc: IntegrityError, constraint_name: str) -> bool:
+    """Check whether an IntegrityError was raised by the given unique index"""
+    orig = getattr(exc.orig, "__cause__", None) or exc.orig
+    if getattr(orig, "constraint_name", None) == constraint_name:
+        return True
+    return constraint_name in str(exc.orig)
+
+
+# User columns + active tier + token version, resolved in one joined round trip
+PRINCIPAL_COLUMNS = (
+    User.id,
+    User.email,
+    User.fullname,
+    User.is_active,
+    User.created_at,
+    func.coalesce(Subscription.tier, "free").label("subscription_tier"),
+    func.coalesce(TokenVersion.version, 0).label("token_version"),
+)
+
+
+def _principal_select(*extra_columns):
+    return (
+        select(*PRINCIPAL_COLUMNS, *extra_columns)
+        .outerjoin(Subscription, Subscription.user_id == User.id)
+        .outerjoin(TokenVersion, TokenVersion.user_id == User.id)
+        .limit(1)
+    )
+
+
+# Principal lookups run on nearly every request: built once at import
+PRINCIPAL_BY_ID_QUERY = _principal_select().filter(User.id == bindparam("user_id"))
+LOGIN_QUERY = _principal_select(User.hashed_password).filter(User.email == bindparam("email"))
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Principal | None:
+    result = await db.execute(LOGIN_QUERY, {"email": email})
+    row = result.first()
+    if not row:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await password_hasher.verify(password, row.hashed_password):
         return None
-    return user
+    return Principal.model_validate(row)
 
 
-
-async def get_user_with_subscription(db: AsyncSession, user_id: str) -> Subscription | None:
-    result = await db.execute(select(Subscription).filter(Subscription.user_id == user_id))
-    return result.scalars().first()
+async def get_principal(db: AsyncSession, user_id: str | uuid.UUID) -> Principal | None:
+    """Fetch the user and their subscription tier in a single query"""
+    if isinstance(user_id, str):
+        try:
+            user_id = uuid.UUID(user_id)
+        except ValueError:
+            return None
+    result = await db.execute(PRINCIPAL_BY_ID_QUERY, {"user_id": user_id})
+    row = result.first()
+    return Principal.model_validate(row) if row else None
 
 
 async def get_user_by_id(db: AsyncSession, user_id: str | uuid.UUID):
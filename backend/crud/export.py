@@ -0,0 +1,59 @@
+import uuid
+from typing import AsyncIterator, Dict
+
+from sqlalchemy import union_all
+from sqlalchemy.future import select
+
+from config.api import settings
+from config.database import AnalyticsSessionLocal
+from models.task import Task
+from models.task_archive import TaskArchive
+
+# Column order of every export (CSV header = keys)
+EXPORT_COLUMNS = {
+    "id": Task.id,
+    "owner_id": Task.owner_id,
+    "title": Task.title,
+    "description": Task.description,
+    "status": Task.status,
+    "due_date": Task.due_date,
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+    "start_at": Task.start_at,
+    "end_at": Task.end_at,
+}
+
+
+def _export_query(owner_id: uuid.UUID | None):
+    """Live and archived tasks (same columns), one owner's ordered by creation"""
+    branches = []
+    for model in (Task, TaskArchive):
+        branch = select(*(getattr(model, name) for name in EXPORT_COLUMNS))
+        if owner_id is not None:
+            branch = branch.filter(model.owner_id == owner_id)
+        branches.append(branch)
+    tasks = union_all(*branches).subquery("tasks")
+    query = select(*tasks.c)
+    if owner_id is not None:
+        # Merge Append over both (owner_id, created_at, id) covering indexes
+        query = query.order_by(tasks.c.created_at, tasks.c.id)
+    return query
+
+
+async def stream_task_rows(owner_id: uuid.UUID | None = None) -> AsyncIterator[Dict]:
+    """
+    Yield task rows as mappings through a server-side cursor, fetching
+    EXPORT_BATCH_SIZE rows per round trip. Opens its own session: a
+    StreamingResponse keeps iterating after request dependencies have exited.
+    owner_id=None streams every user's tasks (admin export). Archived tasks
+    are included.
+    """
+    query = _export_query(owner_id)
+
+    async with AnalyticsSessionLocal() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.mappings().partitions():
+            for row in partition:
+                yield row
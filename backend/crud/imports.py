@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, exists, literal, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from config.api import settings
+from config.database import AnalyticsSessionLocal, advisory_lock
+from crud import quota as crud_quota
+from enums.task_status import TaskStatus
+from models.task import Task
+from models.task_id import TaskId
+from models.task_import import TaskImport, TaskImportRow
+from schemas.task import TaskCreate
+from utils.ingest import first_error_message
+
+logger = logging.getLogger(__name__)
+
+STAGING_COLUMNS = ["import_id", "seq", "row_number", "task_id", "title", "description", "due_date"]
+TITLE_MAX_LENGTH = Task.title.type.length
+
+_merge_slots = asyncio.Semaphore(settings.TASK_IMPORT_MAX_CONCURRENCY)
+_running = set()
+
+
+async def create_import(
+    db: AsyncSession,
+    owner_id: uuid.UUID,
+    filename: str | None,
+    fmt: str,
+    task_limit: int | None,
+) -> TaskImport:
+    task_import = TaskImport(
+        id=uuid.uuid4(),
+        owner_id=owner_id,
+        filename=filename,
+        format=fmt,
+        status="staging",
+        task_limit=task_limit,
+        errors=[],
+    )
+    db.add(task_import)
+    await db.commit()
+    await db.refresh(task_import)
+    return task_import
+
+
+async def get_import(db: AsyncSession, import_id: uuid.UUID, user_id: uuid.UUID) -> TaskImport | None:
+    result = await db.execute(
+        select(TaskImport).filter(TaskImport.id == import_id, TaskImport.owner_id == user_id)
+    )
+    return result.scalars().first()
+
+
+async def _copy_rows(db: AsyncSession, rows):
+    """COPY rows into the staging table on the session's connection"""
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        TaskImportRow.__tablename__, records=rows, columns=STAGING_COLUMNS
+    )
+
+
+async def stage_import(
+    db: AsyncSession,
+    task_import: TaskImport,
+    records: Iterable[Tuple[int, dict | None, str | None]],
+) -> TaskImport:
+    """
+    Validate `records` (from utils.ingest.iter_records) with TaskCreate in
+    chunks and COPY the valid ones into task_import_rows. Staging is one
+    transaction: on failure nothing is staged and the import is marked failed.
+    """
+    errors = []
+    total = valid = 0
+    records = iter(records)
+    try:
+        # Lock the import row first so the COPYs run inside this transaction
+        await db.execute(select(TaskImport.id).where(TaskImport.id == task_import.id).with_for_update())
+
+        while True:
+            chunk = list(islice(records, settings.TASK_IMPORT_STAGE_CHUNK_SIZE))
+            if not chunk:
+                break
+            rows = []
+            for row_number, record, error in chunk:
+                total += 1
+                if error is None:
+                    try:
+                        task = TaskCreate(**record)
+                        if len(task.title) > TITLE_MAX_LENGTH:
+                            error = f"title: must be at most {TITLE_MAX_LENGTH} characters"
+                    except ValidationError as e:
+                        error = first_error_message(e)
+                if error is not None:
+                    if len(errors) < settings.TASK_IMPORT_MAX_ERRORS:
+                        errors.append({"row": row_number, "error": error})
+                    continue
+                valid += 1
+                rows.append((
+                    task_import.id, valid, row_number, uuid.uuid4(),
+                    task.title, task.description, task.due_date,
+                ))
+            if rows:
+                await _copy_rows(db, rows)
+            # Parsing is CPU bound: let other requests in between chunks
+            await asyncio.sleep(0)
+
+        task_import.total_rows = total
+        task_import.valid_rows = valid
+        task_import.invalid_rows = total - valid
+        task_import.errors = errors
+        task_import.status = "merging" if valid else "completed"
+        await db.commit()
+        return task_import
+    except Exception as e:
+        await db.rollback()
+        await db.execute(
+            update(TaskImport)
+            .where(TaskImport.id == task_import.id)
+            .values(status="failed", error=f"Staging failed: {e.__class__.__name__}", updated_at=datetime.utcnow())
+        )
+        await db.commit()
+        raise
+
+
+async def merge_chunk(db: AsyncSession, import_id: uuid.UUID) -> bool:
+    """
+    Move the next TASK_IMPORT_MERGE_CHUNK_SIZE staged rows into tasks and
+    advance merged_through in the same transaction, so a crash never loses
+    or repeats a chunk. Returns True while rows remain.
+
+    Each staged row carries its task id from staging, so a row whose id is
+    already in task_ids was merged before and is skipped: re-running a chunk
+    never inserts it twice.
+    """
+    result = await db.execute(
+        select(TaskImport).where(TaskImport.id == import_id).with_for_update()
+    )
+    task_import = result.scalar_one_or_none()
+    if task_import is None or task_import.status != "merging":
+        return False
+
+    remaining = task_import.valid_rows - task_import.merged_through
+    wanted = min(remaining, settings.TASK_IMPORT_MERGE_CHUNK_SIZE)
+    take = wanted
+    if task_import.task_limit is not None:
+        # Same counter lock as create_task: the free tier limit holds under concurrency
+        slots = await crud_quota.available_task_slots(db, task_import.owner_id, task_import.task_limit)
+        take = min(take, slots)
+
+    start = task_import.merged_through
+    if take > 0:
+        now = datetime.utcnow()
+        staged = (
+            select(
+                TaskImportRow.task_id,
+                literal(task_import.owner_id, Task.owner_id.type),
+                TaskImportRow.title,
+                TaskImportRow.description,
+                TaskImportRow.due_date,
+                literal(TaskStatus.todo, Task.status.type),
+                literal(now, Task.created_at.type),
+                literal(now, Task.updated_at.type),
+            )
+            .where(
+                TaskImportRow.import_id == import_id,
+                TaskImportRow.seq > start,
+                TaskImportRow.seq <= start + take,
+                ~exists().where(TaskId.id == TaskImportRow.task_id),
+            )
+            .order_by(TaskImportRow.seq)
+        )
+        inserted = await db.execute(
+            insert(Task).from_select(
+                ["id", "owner_id", "title", "description", "due_date", "status", "created_at", "updated_at"],
+                staged,
+            )
+        )
+        task_import.merged_through = start + take
+        task_import.imported_rows += inserted.rowcount
+
+    if take < wanted:
+        # Free tier limit reached: the rest of the file is skipped, not failed
+        task_import.skipped_rows = task_import.valid_rows - task_import.merged_through
+        task_import.error = f"Free tier users can only create up to {task_import.task_limit} tasks"
+        task_import.status = "completed"
+    elif task_import.merged_through >= task_import.valid_rows:
+        task_import.status = "completed"
+
+    staged_through = task_import.valid_rows if task_import.status == "completed" else task_import.merged_through
+    await db.execute(
+        delete(TaskImportRow).where(
+            TaskImportRow.import_id == import_id, TaskImportRow.seq <= staged_through
+        )
+    )
+    await db.commit()
+    return task_import.status == "merging"
+
+
+async def run_import(import_id: uuid.UUID) -> None:
+    """
+    Merge a staged import in throttled chunks, each in its own short
+    transaction, pausing between chunks so OLTP traffic keeps its
+    connections and locks. Safe to re-run: it resumes at merged_through.
+    Each import is merged by one worker at a time; others skip it.
+    """
+    async with _merge_slots:
+        try:
+            async with advisory_lock(f"task import {import_id}") as conn:
+                if conn is None:
+                    return  # being merged by another worker
+                while True:
+                    async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+                        more = await merge_chunk(session, import_id)
+                    if not more:
+                        break
+                    await asyncio.sleep(settings.TASK_IMPORT_THROTTLE_SECONDS)
+            logger.info(f"Task import {import_id} finished")
+        except Exception as e:
+            # Left in "merging": resumable via the resume endpoint or on restart
+            logger.error(f"Task import {import_id} stalled: {str(e)}", exc_info=True)
+            async with AnalyticsSessionLocal() as session:
+                await session.execute(
+                    update(TaskImport)
+                    .where(TaskImport.id == import_id)
+                    .values(error=f"Merge interrupted: {e.__class__.__name__}", updated_at=datetime.utcnow())
+                )
+                await session.commit()
+
+
+def schedule_import(import_id: uuid.UUID) -> None:
+    """Run an import merge in the background of this worker"""
+    job = asyncio.create_task(run_import(import_id))
+    _running.add(job)
+    job.add_done_callback(_running.discard)
+
+
+async def resume_pending_imports() -> int:
+    """
+    Restart merges left unfinished by a previous process; returns how many.
+    Every worker calls this at startup: run_import's lock lets only one of
+    them merge each import.
+    """
+    async with AnalyticsSessionLocal() as session:
+        result = await session.execute(select(TaskImport.id).where(TaskImport.status == "merging"))
+        import_ids = result.scalars().all()
+    for import_id in import_ids:
+        schedule_import(import_id)
+    return len(import_ids)
@@ -0,0 +1,27 @@
+from sqlalchemy import cast, func, text
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.future import select
+
+from config.api import settings
+from config.database import AnalyticsSessionLocal
+
+
+async def ensure_task_partitions() -> int:
+    """
+    Create the monthly tasks partitions up to TASK_PARTITION_MONTHS_AHEAD
+    months ahead (tasks_ensure_partitions, see the partitioning migration).
+    Returns how many were created; normally 0.
+    """
+    async with AnalyticsSessionLocal() as session:
+        # Creating a partition locks the parent: fail fast rather than queue writers
+        await session.execute(text("SET LOCAL lock_timeout = '5s'"))
+        result = await session.execute(
+            select(func.tasks_ensure_partitions(
+                cast("tasks", REGCLASS),
+                func.current_date(),
+                settings.TASK_PARTITION_MONTHS_AHEAD,
+            ))
+        )
+        created = result.scalar_one()
+        await session.commit()
+    return created
@@ -0,0 +1,130 @@
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.api import settings
+from models.user import User
+from models.subscription import Subscription
+from schemas.user import UserCreate
+from Security.deps import password_hasher
+from utils.ingest import first_error_message
+
+
+async def provision_users(
+    db: AsyncSession,
+    records: Iterable[Tuple[int, dict | None, str | None]],
+) -> List[Dict]:
+    """
+    Bulk-create users with free subscriptions.
+    `records` are (row_number, record, parse_error) tuples as produced by
+    utils.ingest.iter_records. Returns one result per input row.
+    """
+    results: Dict[int, Dict] = {}
+    pending: List[Tuple[int, UserCreate]] = []
+    seen_emails = set()
+
+    for row_number, record, error in records:
+        if error:
+            results[row_number] = {"row": row_number, "status": "invalid", "error": error}
+            continue
+        try:
+            user = UserCreate(**record)
+        except ValidationError as e:
+            results[row_number] = {
+                "row": row_number,
+                "email": record.get("email"),
+                "status": "invalid",
+                "error": first_error_message(e),
+            }
+            continue
+        if user.email in seen_emails:
+            results[row_number] = {"row": row_number, "email": user.email, "status": "duplicate"}
+            continue
+        seen_emails.add(user.email)
+        pending.append((row_number, user))
+
+    hashed_passwords = await password_hasher.hash_many(
+        [user.password for _, user in pending], workers=settings.PROVISION_HASH_WORKERS
+    )
+
+    chunk_size = settings.PROVISION_CHUNK_SIZE
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        hashes = hashed_passwords[start:start + chunk_size]
+        now = datetime.utcnow()
+
+        try:
+            # Existing emails are skipped by the unique index, not a pre-select
+            user_rows = await db.execute(
+                insert(User)
+                .values([
+                    {
+                        "id": uuid.uuid4(),
+                        "email": user.email,
+                        "fullname": user.fullname,
+                        "hashed_password": hashed,
+                        "is_active": True,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for (_, user), hashed in zip(chunk, hashes)
+                ])
+                .on_conflict_do_nothing(index_elements=[User.email])
+                .returning(User.id, User.email)
+            )
+            created = {row.email: row.id for row in user_rows}
+
+            if created:
+                await db.execute(
+                    insert(Subscription).values([
+                        {
+                            "id": uuid.uuid4(),
+                            "user_id": user_id,
+                            "tier": "free",
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for user_id in created.values()
+                    ])
+                )
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            for row_number, user in chunk:
+                results[row_number] = {
+                    "row": row_number,
+                    "email": user.email,
+                    "status": "failed",
+                    "error": str(e.__class__.__name__),
+                }
+            continue
+
+        for row_number, user in chunk:
+            if user.email in created:
+                results[row_number] = {
+                    "row": row_number,
+                    "email": user.email,
+                    "status": "created",
+                    "id": str(created[user.email]),
+                }
+            else:
+                results[row_number] = {"row": row_number, "email": user.email, "status": "exists"}
+
+    return [results[row_number] for row_number in sorted(results)]
+
+
+def build_provision_report(results: List[Dict]) -> Dict:
+    created = sum(1 for r in results if r["status"] == "created")
+    exists = sum(1 for r in results if r["status"] == "exists")
+    return {
+        "total": len(results),
+        "created": created,
+        "exists": exists,
+        "rejected": len(results) - created - exists,
+        "results": results,
+    }
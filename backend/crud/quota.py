@@ -0,0 +1,49 @@
+import uuid
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models.user_task_stats import UserTaskStats
+
+# Hot statements, built once: each call reuses the compiled SQL and the
+# connection's prepared statement (see config/statements.py)
+_lock_stmt = insert(UserTaskStats).values(user_id=bindparam("user_id"), task_count=0)
+LOCK_TASK_COUNT_QUERY = _lock_stmt.on_conflict_do_update(
+    index_elements=[UserTaskStats.user_id],
+    # no-op update: takes the row lock and returns the current value
+    set_={"task_count": UserTaskStats.task_count},
+).returning(UserTaskStats.task_count)
+
+TASK_COUNT_QUERY = select(UserTaskStats.task_count).where(UserTaskStats.user_id == bindparam("user_id"))
+
+TASKS_VERSION_QUERY = (
+    select(UserTaskStats.tasks_version).where(UserTaskStats.user_id == bindparam("user_id"))
+)
+
+
+async def lock_task_count(db: AsyncSession, user_id: uuid.UUID) -> int:
+    """
+    Lock the user's counter row until the current transaction ends and
+    return the task count. Concurrent creates for the same user serialize
+    here, so a limit checked against this value cannot be overshot.
+    """
+    result = await db.execute(LOCK_TASK_COUNT_QUERY, {"user_id": user_id})
+    return result.scalar_one()
+
+
+async def available_task_slots(db: AsyncSession, user_id: uuid.UUID, limit: int) -> int:
+    """Remaining task slots under `limit`; holds the counter lock (see lock_task_count)"""
+    return max(0, limit - await lock_task_count(db, user_id))
+
+
+async def get_task_count(db: AsyncSession, user_id: uuid.UUID) -> int:
+    """Tasks the user owns, archived ones included (what the free tier limit counts)"""
+    result = await db.execute(TASK_COUNT_QUERY, {"user_id": user_id})
+    return result.scalar_one_or_none() or 0
+
+
+async def get_tasks_version(db: AsyncSession, user_id: uuid.UUID) -> int:
+    """Current version of the user's task collection (0 before the first write)"""
+    result = await db.execute(TASKS_VERSION_QUERY, {"user_id": user_id})
+    return result.scalar_one_or_none() or 0
@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from models.subscription import Subscription
+from Security.cache import invalidate_principal
+from Security.revocation import token_versions
 from datetime import datetime, timedelta
 
 async def change_subscription(db: AsyncSession, user_id: str, new_tier: str):
@@ -36,6 +38,10 @@ async def change_subscription(db: AsyncSession, user_id: str, new_tier: str):
             subscription.start_date = datetime.utcnow()
             subscription.end_date = datetime.utcnow() + timedelta(days=30)
 
+    # Outstanding tokens carry the old tier claim; bump so they are re-checked
+    version = await token_versions.bump(db, user_id)
     await db.commit()
+    invalidate_principal(user_id)
+    token_versions.remember(user_id, version)
     await db.refresh(subscription)
     return subscription
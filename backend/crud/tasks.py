@@ -1,23 +1,308 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
+from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import and_, or_, tuple_, func, any_, literal, insert, update, delete, union_all, bindparam, cast, Text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.exc import SQLAlchemyError
-from models.task import Task
+from models.task import Task, XID8
+from models.task_archive import TaskArchive
+from models.task_tombstone import TaskTombstone
 from enums.task_status import TaskStatus
 from schemas.task import TaskCreate, TaskUpdate
+from utils.cursor import encode_cursor, decode_cursor
 
-async def get_tasks(db: AsyncSession, user_id: uuid.UUID):
-    result = await db.execute(select(Task).filter(Task.owner_id == user_id))
-    tasks = result.scalars().all()
-    return tasks
+# TaskResponse fields: list endpoints select these as Core rows, no ORM entities
+TASK_RESPONSE_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.due_date,
+    Task.status,
+    Task.created_at,
+    Task.updated_at,
+    Task.start_at,
+    Task.end_at,
+)
 
+TASK_FIELDS = {column.key: column for column in TASK_RESPONSE_COLUMNS}
 
-# Get task via task id
-async def get_task(db: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID):
+
+def parse_task_fields(fields: str | None, *required) -> tuple:
+    """
+    Columns for a `fields=` sparse fieldset (comma-separated TaskResponse
+    names). id and `required` columns are always selected; None selects all.
+    Raises ValueError on unknown names.
+    """
+    if not fields:
+        return TASK_RESPONSE_COLUMNS
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = names - TASK_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    names |= {"id"} | {column.key for column in required}
+    return tuple(column for column in TASK_RESPONSE_COLUMNS if column.key in names)
+
+
+# Sort keys accepted by list endpoints -> column (ties broken by id)
+TASK_SORT_COLUMNS = {
+    "created": Task.created_at,
+    "due": Task.due_date,
+    "title": Task.title,
+    "status": Task.status,
+}
+
+
+def _encode_sort_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, TaskStatus):
+        return value.value
+    return value
+
+
+def _decode_sort_value(sort: str, value):
+    if value is None:
+        return None
+    if sort in ("created", "due"):
+        return datetime.fromisoformat(value)
+    if sort == "status":
+        return TaskStatus(value)
+    return value
+
+
+def _keyset_condition(column, id_column, value, last_id: uuid.UUID, descending: bool):
+    """
+    Rows strictly after (value, last_id) in ORDER BY column, id.
+    Postgres sorts NULLs last ascending and first descending, so the null
+    segment is handled explicitly to keep the scan on the composite index.
+    """
+    if not descending:
+        if value is None:
+            return and_(column.is_(None), id_column > last_id)
+        return or_(tuple_(column, id_column) > tuple_(value, last_id), column.is_(None))
+    if value is None:
+        return or_(and_(column.is_(None), id_column < last_id), column.is_not(None))
+    return tuple_(column, id_column) < tuple_(value, last_id)
+
+
+def _ordered(query, column, id_column, descending: bool):
+    if descending:
+        return query.order_by(column.desc(), id_column.desc())
+    return query.order_by(column.asc(), id_column.asc())
+
+
+def _task_list_query(model, columns, user_id, status, due_from, due_to, sort, keyset, descending, limit):
+    """
+    One ordered, limited page of `model` (Task or TaskArchive, which share
+    the column names) for get_tasks.
+    """
+    column = getattr(model, TASK_SORT_COLUMNS[sort].key)
+    query = select(*(getattr(model, c.key) for c in columns)).filter(model.owner_id == user_id)
+    if status is not None:
+        query = query.filter(model.status == status)
+    if due_from is not None:
+        query = query.filter(model.due_date >= due_from)
+    if due_to is not None:
+        query = query.filter(model.due_date < due_to)
+    if keyset is not None:
+        query = query.filter(_keyset_condition(column, model.id, *keyset, descending))
+    return _ordered(query, column, model.id, descending).limit(limit)
+
+
+async def get_tasks(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    status: TaskStatus | None = None,
+    due_from: datetime | None = None,
+    due_to: datetime | None = None,
+    sort: str = "created",
+    order: str = "desc",
+    limit: int = 50,
+    cursor: str | None = None,
+    fields: str | None = None,
+    include_archived: bool = False,
+):
+    """
+    Keyset-paginated task list. Returns (rows, next_cursor): Core rows with
+    the `fields` columns (plus the sort key), next_cursor None on the last
+    page. With include_archived, tasks_archive rows are merged in on the
+    same key. Raises ValueError for a cursor from another sort or unknown fields.
+    """
+    column = TASK_SORT_COLUMNS[sort]
+    descending = order == "desc"
+    columns = parse_task_fields(fields, column)
+
+    keyset = None
+    if cursor:
+        try:
+            cursor_sort, cursor_order, value, last_id = decode_cursor(cursor)
+            keyset = _decode_sort_value(sort, value), uuid.UUID(last_id)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        if (cursor_sort, cursor_order) != (sort, order):
+            raise ValueError("Cursor does not match the requested sort")
+
+    branch = (user_id, status, due_from, due_to, sort, keyset, descending, limit + 1)
+    query = _task_list_query(Task, columns, *branch)
+    if include_archived:
+        # Each side stops at limit + 1 on its own index; the merge re-sorts
+        # at most 2 * (limit + 1) rows
+        merged = union_all(query, _task_list_query(TaskArchive, columns, *branch)).subquery("tasks")
+        query = _ordered(select(*merged.c), merged.c[column.key], merged.c.id, descending).limit(limit + 1)
+
+    result = await db.execute(query)
+    tasks = result.all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        next_cursor = encode_cursor(
+            [sort, order, _encode_sort_value(getattr(last, column.key)), str(last.id)]
+        )
+    return tasks, next_cursor
+
+
+async def search_tasks(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    query_text: str,
+    limit: int = 20,
+    cursor: str | None = None,
+    fields: str | None = None,
+):
+    """
+    Owner-scoped full-text search over title + description, best match first.
+    Returns (rows, next_cursor) like get_tasks.
+    """
+    columns = parse_task_fields(fields)
+    offset = 0
+    if cursor:
+        try:
+            kind, offset = decode_cursor(cursor)
+            if kind != "search" or not isinstance(offset, int) or offset < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    ts_query = func.websearch_to_tsquery("english", query_text)
+    rank = func.ts_rank_cd(Task.search_vector, ts_query)
     result = await db.execute(
-        select(Task).filter(Task.id == task_id, Task.owner_id == user_id)
+        select(*columns)
+        .filter(Task.owner_id == user_id, Task.search_vector.op("@@")(ts_query))
+        .order_by(rank.desc(), Task.id)
+        .offset(offset)
+        .limit(limit + 1)
     )
+    tasks = result.all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(["search", offset + limit])
+    return tasks, next_cursor
+
+
+def _changes_cursor(change_xid: str, last_id: uuid.UUID) -> str:
+    return encode_cursor(["changes", change_xid, str(last_id)])
+
+
+# Oldest transaction still running for the reader: every id below it has
+# committed (or aborted), so nothing can appear behind a cursor under it
+SNAPSHOT_XMIN_QUERY = select(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text))
+
+
+async def get_task_changes(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    since: str | None = None,
+    limit: int = 100,
+    fields: str | None = None,
+):
+    """
+    Tasks written and tasks deleted after `since`, in commit-safe order: by
+    the id of the writing transaction (change_xid), then task id. Only
+    changes from transactions below the snapshot xmin are returned, so a
+    slow transaction that commits later is picked up by the next sync rather
+    than skipped. Both sources are walked on their (owner, change_xid, id)
+    index and merged. Returns (changes, next_cursor, has_more); next_cursor
+    is always set so clients can resume from it on the next sync.
+    """
+    last_xid, last_id = None, None
+    if since:
+        try:
+            kind, last_xid, last_id = decode_cursor(since)
+            if kind != "changes" or not isinstance(last_xid, str):
+                raise ValueError
+            last_id = uuid.UUID(last_id)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        if not last_xid.isdigit():
+            # updated_at cursor from before change_xid: sync again from the start
+            last_xid, last_id = None, None
+
+    horizon = cast(literal((await db.execute(SNAPSHOT_XMIN_QUERY)).scalar_one()), XID8)
+    task_query = (
+        select(*parse_task_fields(fields, Task.updated_at), cast(Task.change_xid, Text).label("change_xid"))
+        .filter(Task.owner_id == user_id, Task.change_xid < horizon)
+    )
+    tombstone_query = (
+        select(TaskTombstone.task_id, TaskTombstone.deleted_at, cast(TaskTombstone.change_xid, Text).label("change_xid"))
+        .filter(TaskTombstone.owner_id == user_id, TaskTombstone.change_xid < horizon)
+    )
+    if last_xid is not None:
+        after = cast(literal(last_xid), XID8)
+        task_query = task_query.filter(tuple_(Task.change_xid, Task.id) > tuple_(after, last_id))
+        tombstone_query = tombstone_query.filter(
+            tuple_(TaskTombstone.change_xid, TaskTombstone.task_id) > tuple_(after, last_id)
+        )
+
+    tasks = (await db.execute(
+        task_query.order_by(Task.change_xid, Task.id).limit(limit + 1)
+    )).all()
+    tombstones = (await db.execute(
+        tombstone_query.order_by(TaskTombstone.change_xid, TaskTombstone.task_id).limit(limit + 1)
+    )).all()
+
+    changes = []
+    for t in tasks:
+        task = dict(t._mapping)
+        changes.append({"id": t.id, "deleted": False, "changed_at": t.updated_at,
+                        "change_xid": task.pop("change_xid"), "task": task})
+    changes += [
+        {"id": t.task_id, "deleted": True, "changed_at": t.deleted_at, "change_xid": t.change_xid, "task": None}
+        for t in tombstones
+    ]
+    changes.sort(key=lambda change: (int(change["change_xid"]), change["id"]))
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    if changes:
+        last = changes[-1]
+        next_cursor = _changes_cursor(last["change_xid"], last["id"])
+    else:
+        next_cursor = since if last_xid is not None else _changes_cursor("0", uuid.UUID(int=0))
+    for change in changes:
+        del change["change_xid"]
+    return changes, next_cursor, has_more
+
+
+# Get task via task id
+# Hot single-task statements, built once (see config/statements.py)
+TASK_BY_ID_QUERY = select(Task).filter(Task.id == bindparam("task_id"), Task.owner_id == bindparam("user_id"))
+
+DELETE_TASK_QUERY = (
+    delete(Task)
+    .where(Task.id == bindparam("task_id"), Task.owner_id == bindparam("user_id"))
+    .returning(Task.id)
+    .execution_options(synchronize_session=False)
+)
+
+
+async def get_task(db: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID):
+    result = await db.execute(TASK_BY_ID_QUERY, {"task_id": task_id, "user_id": user_id})
     return result.scalars().first()
 
 
@@ -37,40 +322,124 @@ async def create_task(db: AsyncSession, user_id: uuid.UUID, task: TaskCreate):
     return new_task
 
 
-async def update_task_status(db: AsyncSession, db_task: Task, status: TaskStatus):
-    now = datetime.utcnow()
+# Status change in one round trip: UPDATE ... RETURNING (None -> not found)
+async def update_task_status(
+    db: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID, status: TaskStatus
+) -> Task | None:
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.owner_id == user_id)
+        .values(**_status_transition_values(status))
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.scalars().first()
+    await db.commit()
+    return task
+
+
+# Delete task in one round trip; False when nothing matched
+async def delete_task(db: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+    result = await db.execute(DELETE_TASK_QUERY, {"task_id": task_id, "user_id": user_id})
+    deleted = result.scalar_one_or_none()
+    await db.commit()
+    return deleted is not None
+
+# Update task fully in one round trip: UPDATE ... RETURNING (None -> not found)
+async def update_task(
+    db: AsyncSession,
+    task_id: uuid.UUID,
+    user_id: uuid.UUID,
+    updates: TaskUpdate,
+) -> Task | None:
+    values = updates.model_dump(exclude_unset=True)
+    if not values:
+        return await get_task(db, task_id, user_id)
+
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.owner_id == user_id)
+        .values(**values)
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.scalars().first()
+    await db.commit()
+    return task
 
-    # If task moves to "in_progress" → set start_at if not already set
-    if status == TaskStatus.in_progress and not db_task.start_at:
-        db_task.start_at = now
 
-    # If task moves to "completed" → set end_at
-    if status == TaskStatus.completed and not db_task.end_at:
-        db_task.end_at = now
+def _owned_ids(user_id: uuid.UUID, ids: List[uuid.UUID]):
+    """owner_id = :uid AND id = ANY(:ids) -- one statement shape for any list length"""
+    return and_(
+        Task.owner_id == user_id,
+        Task.id == any_(literal(ids, ARRAY(UUID(as_uuid=True)))),
+    )
+
+
+def _status_transition_values(status: TaskStatus) -> dict:
+    """
+    SET clause for a status change, shared by the single and bulk updates.
+    start_at/end_at are stamped once, as before the UPDATE ... RETURNING
+    rewrite: the first time a task enters in_progress/completed, and
+    COALESCE keeps the existing value on later transitions.
+    """
+    now = datetime.utcnow()
+    values = {"status": status}
+    if status == TaskStatus.in_progress:
+        values["start_at"] = func.coalesce(Task.start_at, now)
+    if status == TaskStatus.completed:
+        values["end_at"] = func.coalesce(Task.end_at, now)
+    return values
 
-    db_task.status = status
+
+# Bulk create: one multi-row INSERT ... RETURNING
+async def bulk_create_tasks(db: AsyncSession, user_id: uuid.UUID, tasks: List[TaskCreate]) -> List[Task]:
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "owner_id": user_id,
+            "title": task.title,
+            "description": task.description,
+            "due_date": task.due_date,
+            "status": TaskStatus.todo,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for task in tasks
+    ]
+    # Request order is restored by id: sort_by_parameter_order matches on the
+    # whole (id, created_at) key, and RETURNING hands created_at back tz-aware
+    result = await db.execute(insert(Task).returning(Task), rows)
+    created = {task.id: task for task in result.scalars().all()}
     await db.commit()
-    await db.refresh(db_task)
-    return db_task
+    return [created[row["id"]] for row in rows]
 
 
-# Delete task 
-async def delete_task(db: AsyncSession, db_task: Task):
-    await db.delete(db_task)
+# Bulk status change: one UPDATE ... WHERE owner_id AND id = ANY(...) RETURNING
+async def bulk_update_task_status(
+    db: AsyncSession, user_id: uuid.UUID, ids: List[uuid.UUID], status: TaskStatus
+) -> List[Task]:
+    result = await db.execute(
+        update(Task)
+        .where(_owned_ids(user_id, ids))
+        .values(**_status_transition_values(status))
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    updated = result.scalars().all()
     await db.commit()
+    return updated
 
-# Count total task a user have
-async def count_user_tasks(db: AsyncSession, user_id: uuid.UUID) -> int:
-    result = await db.execute(select(Task).filter(Task.owner_id == user_id))
-    return len(result.scalars().all())
 
-# Update task fully
-async def update_task(
-    db: AsyncSession, 
-    db_task: Task, 
-    updates: TaskUpdate): 
-    for key, value in updates.dict(exclude_unset=True).items(): 
-        setattr(db_task, key, value) 
-    await db.commit() 
-    await db.refresh(db_task) 
-    return db_task
\ No newline at end of file
+# Bulk delete: one DELETE ... RETURNING id
+async def bulk_delete_tasks(db: AsyncSession, user_id: uuid.UUID, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+    result = await db.execute(
+        delete(Task)
+        .where(_owned_ids(user_id, ids))
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.scalars().all()
+    await db.commit()
+    return deleted
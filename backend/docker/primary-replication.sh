@@ -0,0 +1,4 @@
+#!/bin/bash
+# Runs once on a fresh primary volume: lets the db_replica service stream WAL
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
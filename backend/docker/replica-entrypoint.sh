@@ -0,0 +1,13 @@
+#!/bin/bash
+# Local streaming replica of the db service (docker compose --profile replica up).
+# Clones the primary on first start, then runs as a hot standby.
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until pg_basebackup -h db -p 5432 -U "$PG_USER" -D "$PGDATA" -R -X stream; do
+        echo "Waiting for the primary..."
+        rm -rf "${PGDATA:?}"/*
+        sleep 2
+    done
+    chmod 700 "$PGDATA"
+fi
+exec postgres -c hot_standby=on
@@ -2,24 +2,66 @@ import uuid
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    Column, String, Integer, Boolean, DateTime, Text, Enum, ForeignKey
+    Column, String, Integer, Boolean, DateTime, Text, Enum, ForeignKey, Index, text
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred
+from sqlalchemy.types import UserDefinedType
 
 
 from config.database import Base
 from enums.task_status import TaskStatus
 
+class XID8(UserDefinedType):
+    """Postgres xid8 (transaction id); read and compared as text casts"""
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "XID8"
+
+
 class Task(Base):
     __tablename__ = "tasks"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(Enum(TaskStatus, name="task_status"), nullable=False, default=TaskStatus.todo)
     due_date = Column(DateTime(timezone=True), nullable=True, index=True)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, index=True)
+    # Partition key (monthly RANGE partitions), hence part of the primary key;
+    # id uniqueness is enforced through task_ids (models/task_id.py)
+    created_at = Column(DateTime(timezone=True), primary_key=True, default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
     start_at = Column(DateTime(timezone=True), nullable=True)
     end_at = Column(DateTime(timezone=True), nullable=True)
- 
\ No newline at end of file
+    # Maintained by the tasks_search_vector_update trigger; never set from Python
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    # Transaction that last wrote the row, set by the tasks_set_change_xid trigger
+    change_xid = deferred(Column(XID8, nullable=False, server_default=text("'0'")))
+
+    # Keyset pagination: one (owner, sort key, id) index per list sort.
+    # Every owner-scoped query is served by one of these, so owner_id has no index of its own.
+    __table_args__ = (
+        # Also covers the mcp-server insights aggregates (index-only scans)
+        Index(
+            "ix_tasks_owner_created_covering", "owner_id", "created_at", "id",
+            postgresql_include=["status", "due_date", "start_at", "end_at"],
+        ),
+        Index("ix_tasks_owner_due_id", "owner_id", "due_date", "id"),
+        Index("ix_tasks_owner_title_id", "owner_id", "title", "id"),
+        Index("ix_tasks_owner_status_id", "owner_id", "status", "id"),
+        # Delta sync: GET /tasks/changes walks (change_xid, id) per owner
+        Index("ix_tasks_owner_xid_id", "owner_id", "change_xid", "id"),
+        # Overdue list (mcp-server TaskAnalyzer.get_overdue_tasks): open tasks only
+        Index(
+            "ix_tasks_owner_due_open", "owner_id", "due_date",
+            postgresql_where=text("status <> 'completed'"),
+        ),
+        # Archival job candidates (crud/archive.py)
+        Index(
+            "ix_tasks_completed_updated", "updated_at",
+            postgresql_where=text("status = 'completed'"),
+        ),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, DateTime, Text, Enum, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+
+
+from config.database import Base
+from enums.task_status import TaskStatus
+
+
+class TaskArchive(Base):
+    """
+    Completed tasks moved out of `tasks` by the archival job (crud/archive.py).
+    Same columns as Task, so reads can UNION ALL both (see tasks_with_archive).
+    """
+    __tablename__ = "tasks_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(Enum(TaskStatus, name="task_status", create_type=False), nullable=False)
+    due_date = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    start_at = Column(DateTime(timezone=True), nullable=True)
+    end_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_tasks_archive_owner_created_covering", "owner_id", "created_at", "id",
+            postgresql_include=["status", "due_date", "start_at", "end_at"],
+        ),
+    )
@@ -0,0 +1,16 @@
+from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import UUID
+
+
+from config.database import Base
+
+
+class TaskId(Base):
+    """
+    Every live task id, kept by the tasks_ids_* triggers. tasks is partitioned
+    by created_at, so its primary key (id, created_at) alone no longer makes
+    id unique; this table does.
+    """
+    __tablename__ = "task_ids"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
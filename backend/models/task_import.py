@@ -0,0 +1,50 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+
+from config.database import Base
+
+
+class TaskImport(Base):
+    """One bulk task import: progress counters and a capped list of row errors"""
+    __tablename__ = "task_imports"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    filename = Column(String(255), nullable=True)
+    format = Column(String(16), nullable=False)
+    status = Column(String(16), nullable=False, default="staging")  # staging | merging | completed | failed
+    # Free tier cap at submission time; None means unlimited
+    task_limit = Column(Integer, nullable=True)
+    total_rows = Column(Integer, nullable=False, default=0)
+    valid_rows = Column(Integer, nullable=False, default=0)
+    invalid_rows = Column(Integer, nullable=False, default=0)
+    # Staged rows with seq <= merged_through are already in tasks
+    merged_through = Column(Integer, nullable=False, default=0)
+    imported_rows = Column(Integer, nullable=False, default=0)
+    skipped_rows = Column(Integer, nullable=False, default=0)
+    errors = Column(JSONB, nullable=False, default=list)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_task_imports_owner_created", "owner_id", "created_at"),
+    )
+
+
+class TaskImportRow(Base):
+    """Validated rows loaded with COPY, waiting to be merged into tasks"""
+    __tablename__ = "task_import_rows"
+
+    import_id = Column(UUID(as_uuid=True), ForeignKey("task_imports.id", ondelete="CASCADE"), primary_key=True)
+    # Contiguous 1..valid_rows so merge chunks are plain seq ranges
+    seq = Column(Integer, primary_key=True)
+    row_number = Column(Integer, nullable=False)
+    # Generated at staging, so merged rows keep a stable id across retries
+    task_id = Column(UUID(as_uuid=True), nullable=False)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    due_date = Column(DateTime(timezone=True), nullable=True)
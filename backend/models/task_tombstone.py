@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+
+
+from config.database import Base
+from models.task import XID8
+
+
+class TaskTombstone(Base):
+    """Deleted task ids for delta sync, written by the tasks_tombstone trigger"""
+    __tablename__ = "task_tombstones"
+
+    task_id = Column(UUID(as_uuid=True), primary_key=True)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    change_xid = Column(XID8, nullable=False, server_default=text("'0'"))
+
+    __table_args__ = (
+        Index("ix_task_tombstones_owner_xid_task", "owner_id", "change_xid", "task_id"),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+
+from config.database import Base
+
+
+class UserTaskStats(Base):
+    """Per-user task counters, maintained by statement-level triggers on tasks"""
+    __tablename__ = "user_task_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    # Bumped once per statement that inserts/updates/deletes the user's tasks
+    tasks_version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,38 @@
+"""
+Bulk user provisioning from the command line.
+
+    python provision.py users.ndjson
+    python provision.py users.csv --format csv > report.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from config.database import AsyncSessionLocal
+from crud.provisioning import provision_users, build_provision_report
+from utils.ingest import detect_format, iter_records
+
+
+async def run(path: str, fmt: str | None) -> dict:
+    fmt = detect_format(path, fmt)
+    with open(path, encoding="utf-8-sig", newline="") as stream:
+        async with AsyncSessionLocal() as session:
+            results = await provision_users(session, iter_records(stream, fmt))
+    return build_provision_report(results)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Provision users from NDJSON/CSV")
+    parser.add_argument("path", help="File with email, fullname, password per row")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.path, args.format))
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if report["rejected"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
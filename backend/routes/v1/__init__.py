@@ -5,6 +5,7 @@ from routes.v1.tasks import router as task_router
 from routes.v1.subscriptions import router as subscription_router
 from routes.v1.account import router as account_router
 from routes.v1.process import router as mcp_client_router
+from routes.v1.admin import router as admin_router
 
 router = APIRouter(prefix="/v1")
 
@@ -13,4 +14,5 @@ router.include_router(auth_router, prefix="/auth", tags=["Auth"])
 router.include_router(task_router, prefix="/tasks", tags=["Tasks"])
 router.include_router(subscription_router, prefix="/subscriptions", tags=["Subscriptions"])
 router.include_router(account_router, prefix="/account", tags=["Account"])
-router.include_router(mcp_client_router, prefix="/process", tags=["MCP"])
\ No newline at end of file
+router.include_router(mcp_client_router, prefix="/process", tags=["MCP"])
+router.include_router(admin_router, prefix="/admin", tags=["Admin"])
\ No newline at end of file
@@ -0,0 +1,54 @@
+import uuid
+import logging
+from typing import Literal
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import get_db
+from crud.export import EXPORT_COLUMNS, stream_task_rows
+from crud.provisioning import provision_users, build_provision_report
+from schemas.admin import ProvisionReport
+from Security.admin import admin_required
+from utils.export import export_response
+from utils.ingest import detect_format, iter_records, text_stream
+
+router = APIRouter(dependencies=[Depends(admin_required)])
+logger = logging.getLogger(__name__)
+
+
+@router.post("/users/provision", response_model=ProvisionReport)
+async def provision_users_route(
+    file: UploadFile = File(...),
+    format: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Bulk-create users from an NDJSON or CSV upload (email, fullname, password)"""
+    try:
+        fmt = detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"Admin bulk provisioning started from {file.filename} ({fmt})")
+    try:
+        results = await provision_users(db, iter_records(text_stream(file.file), fmt))
+        report = build_provision_report(results)
+        logger.info(
+            f"Bulk provisioning finished: {report['created']} created, "
+            f"{report['exists']} existing, {report['rejected']} rejected"
+        )
+        return report
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk provisioning failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Bulk provisioning failed")
+
+
+@router.get("/tasks/export")
+async def export_all_tasks(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    owner_id: uuid.UUID | None = None,
+):
+    """Stream every user's tasks (or one owner's) for warehouse loads"""
+    logger.info(f"Admin task export started ({format}, owner={owner_id or 'all'})")
+    return export_response(stream_task_rows(owner_id), format, list(EXPORT_COLUMNS), "tasks")
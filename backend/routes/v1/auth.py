@@ -3,11 +3,14 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 
-from models.user import User
-from config.database import get_db
-from schemas.user import UserResponse, UserCreate, TokenResponse
+from config.database import get_auth_db
+from schemas.user import UserResponse, UserCreate, TokenResponse, AccessTokenResponse, Principal
 from crud import auth as crud_auth
-from Security.token import create_access_token, get_current_user
+from crud import quota as crud_quota
+from Security.cache import principal_cache
+from Security.token import (
+    create_principal_token, get_current_reader, get_current_user, get_read_db, get_token_payload, needs_refresh
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -16,7 +19,7 @@ logger = logging.getLogger(__name__)
 @router.post("/login", response_model=TokenResponse)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_auth_db)
 ):
     logger.info(f"Login attempt for username: {form_data.username}")
 
@@ -26,17 +29,18 @@ async def login(
             logger.warning(f"Failed login for username: {form_data.username}")
             raise HTTPException(status_code=401, detail="Invalid email or password")
 
-        subscription = await crud_auth.get_user_with_subscription(db, user.id)
-        access_token = create_access_token(data={"sub": str(user.id)})
+        principal_cache.set(str(user.id), user)
+        access_token = create_principal_token(user)
+        task_count = await crud_quota.get_task_count(db, user.id)
 
-        logger.info(f"User {user.email} logged in successfully with subscription: "
-                    f"{subscription.tier if subscription else 'free'}")
+        logger.info(f"User {user.email} logged in successfully with subscription: {user.subscription_tier}")
 
         return {
             "access_token": access_token,
             "token_type": "bearer",
             "user": user,
-            "subscription_tier": subscription.tier if subscription else "free"
+            "subscription_tier": user.subscription_tier,
+            "task_count": task_count,
         }
     except HTTPException:
         raise
@@ -48,46 +52,61 @@ async def login(
 @router.post("/register", response_model=UserResponse)
 async def register(
     user: UserCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_auth_db)
 ):
     logger.info(f"Registration attempt for email: {user.email}")
 
     try:
-        existing_user = await crud_auth.get_user_by_email(db, user.email)
-        if existing_user:
-            logger.warning(f"Registration failed - email already exists: {user.email}")
-            raise HTTPException(status_code=400, detail="Email already registered")
-
         new_user = await crud_auth.create_user_with_subscription(db, user)
         logger.info(f"User registered successfully: {new_user.email}")
         return new_user
-    except HTTPException:
+    except HTTPException as e:
+        logger.warning(f"Registration failed for email {user.email}: {e.detail}")
         raise
     except Exception as e:
         logger.error(f"Unexpected error during registration for email {user.email}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Registration failed")
 
 
-@router.get("/me", response_model=TokenResponse)
+@router.get("/me", response_model=TokenResponse, response_model_exclude_none=True)
 async def get_current_user_info(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    payload: dict = Depends(get_token_payload),
+    current_user: Principal = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db)
 ):
     logger.info(f"Fetching profile for user: {current_user.email}")
 
     try:
-        subscription = await crud_auth.get_user_with_subscription(db, current_user.id)
-        access_token = create_access_token(data={"sub": str(current_user.id)})
+        # Principal from the cache plus one counter row; only re-mint close to expiry
+        access_token = create_principal_token(current_user) if needs_refresh(payload) else None
+        task_count = await crud_quota.get_task_count(db, current_user.id)
 
         logger.info(f"Profile data returned for user: {current_user.email}, "
-                    f"subscription: {subscription.tier if subscription else 'free'}")
+                    f"subscription: {current_user.subscription_tier}")
 
         return {
             "access_token": access_token,
             "token_type": "bearer",
             "user": current_user,
-            "subscription_tier": subscription.tier if subscription else "free"
+            "subscription_tier": current_user.subscription_tier,
+            "task_count": task_count,
         }
     except Exception as e:
         logger.error(f"Failed to fetch profile for user {current_user.email}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to fetch profile")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch profile")
+
+
+@router.post("/refresh", response_model=AccessTokenResponse)
+async def refresh_access_token(
+    current_user: Principal = Depends(get_current_user)
+):
+    logger.info(f"Refreshing access token for user: {current_user.email}")
+
+    try:
+        return {
+            "access_token": create_principal_token(current_user),
+            "token_type": "bearer",
+        }
+    except Exception as e:
+        logger.error(f"Failed to refresh token for user {current_user.email}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to refresh token")
\ No newline at end of file
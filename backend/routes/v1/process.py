@@ -1,10 +1,11 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 import json
 
 from config.api import settings
+from config.database import replica_lags
 from utils.sse_client import call_mcp_tool
-from Security.token import get_current_user, premium_user
+from Security.token import READ_MARKER_HEADER, get_current_user, premium_user, read_marker_lsn
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -13,7 +14,8 @@ logger = logging.getLogger(__name__)
 @router.get("/query")
 async def query_tasks(
     query: str,
-    current_user=Depends(premium_user)
+    current_user=Depends(premium_user),
+    read_after: str | None = Header(None, alias=READ_MARKER_HEADER),
 ):
     """Natural language query about user tasks"""
     logger.info(f"User {current_user.email} (id={current_user.id}) submitted query: {query}")
@@ -21,7 +23,8 @@ async def query_tasks(
     try:
         result = await call_mcp_tool("query_task_data", {
             "user_id": current_user.id,
-            "query": query
+            "query": query,
+            "consistent": await replica_lags(read_marker_lsn(read_after)),
         })
         logger.info(f"Query executed successfully for user {current_user.email} (id={current_user.id})")
         return {"success": "True", "data": result}
@@ -36,7 +39,8 @@ async def query_tasks(
 @router.get("/monthly_summary")
 async def monthly_summary(
     current_user=Depends(premium_user),
-    month_offset: int = 0
+    month_offset: int = 0,
+    read_after: str | None = Header(None, alias=READ_MARKER_HEADER),
 ):
     """Get monthly summary for tasks"""
     logger.info(f"User {current_user.email} (id={current_user.id}) requested monthly summary (offset={month_offset})")
@@ -44,7 +48,8 @@ async def monthly_summary(
     try:
         result = await call_mcp_tool("get_monthly_summary", {
             "user_id": current_user.id,
-            "month_offset": month_offset
+            "month_offset": month_offset,
+            "consistent": await replica_lags(read_marker_lsn(read_after)),
         })
 
         if isinstance(result, dict):
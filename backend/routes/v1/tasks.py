@@ -1,35 +1,227 @@
+import json
 import uuid
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse
+from sse_starlette.sse import EventSourceResponse
 
-from Security.token import get_current_user
+from Security.token import get_current_reader, get_current_user, get_read_db
 from enums.task_status import TaskStatus
 from config.database import get_db
-from schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from schemas.task import (
+    TaskCreate, TaskResponse, TaskUpdate, TaskPage, TaskChangePage,
+    TaskBulkCreate, TaskBulkStatusUpdate, TaskBulkDelete, TaskBulkResult, TaskImportStatus,
+)
 from crud import tasks as crud_task
-from crud import auth as crud_auth
+from crud import quota as crud_quota
+from crud import imports as crud_imports
+from crud.export import EXPORT_COLUMNS, stream_task_rows
+from config.api import settings
+from utils.etag import make_etag, etag_matches
+from utils.export import export_response
+from utils.serialize import json_response, rows_to_dicts
+from utils.task_events import task_events
+from utils.ingest import detect_format, iter_records, text_stream
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+FIELDS_DESCRIPTION = (
+    "Comma-separated task fields to return, e.g. id,title,status. "
+    "id (and the sort key) are always included; omit for all fields."
+)
 
-@router.get("/", response_model=list[TaskResponse])
+
+@router.get("/", response_model=TaskPage)
 async def list_tasks(
-    db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user),
+    request: Request,
+    status_filter: TaskStatus | None = Query(None, alias="status"),
+    due_from: datetime | None = None,
+    due_to: datetime | None = None,
+    sort: Literal["created", "due", "title", "status"] = "created",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    include_archived: bool = Query(False, description="Also list completed tasks moved to the archive"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_reader),
 ):
-    logger.info(f"User {current_user.email} (id={current_user.id}) requested task list")
+    logger.info(f"User {current_user.email} (id={current_user.id}) requested task list "
+                f"(status={status_filter}, sort={sort} {order}, limit={limit})")
     try:
-        tasks = await crud_task.get_tasks(db, current_user.id)
+        # Version first: if a write lands before the rows are read the ETag
+        # is older than the body, so the next request just refetches
+        version = await crud_quota.get_tasks_version(db, current_user.id)
+        etag = make_etag(version, str(current_user.id), request.url.query)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            logger.info(f"Task list unchanged for user {current_user.email} (304)")
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        tasks, next_cursor = await crud_task.get_tasks(
+            db, current_user.id,
+            status=status_filter, due_from=due_from, due_to=due_to,
+            sort=sort, order=order, limit=limit, cursor=cursor, fields=fields,
+            include_archived=include_archived,
+        )
         logger.info(f"Returned {len(tasks)} tasks for user {current_user.email}")
-        return tasks
+        return json_response(
+            {"items": rows_to_dicts(tasks), "next_cursor": next_cursor},
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch tasks for user {current_user.email}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch tasks")
 
 
+@router.get("/search", response_model=TaskPage)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    logger.info(f"User {current_user.email} (id={current_user.id}) searched tasks: {q}")
+    try:
+        tasks, next_cursor = await crud_task.search_tasks(
+            db, current_user.id, q, limit=limit, cursor=cursor, fields=fields
+        )
+        logger.info(f"Search returned {len(tasks)} tasks for user {current_user.email}")
+        return json_response({"items": rows_to_dicts(tasks), "next_cursor": next_cursor})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to search tasks for user {current_user.email}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to search tasks")
+
+
+@router.get("/changes", response_model=TaskChangePage)
+async def task_changes(
+    since: str | None = None,
+    limit: int = Query(100, ge=1, le=500),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    logger.info(f"User {current_user.email} (id={current_user.id}) requested task changes")
+    try:
+        changes, next_cursor, has_more = await crud_task.get_task_changes(
+            db, current_user.id, since=since, limit=limit, fields=fields
+        )
+        logger.info(f"Returned {len(changes)} task changes for user {current_user.email}")
+        return json_response({"changes": changes, "next_cursor": next_cursor, "has_more": has_more})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to fetch task changes for user {current_user.email}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to fetch task changes")
+
+
+@router.get("/stream")
+async def stream_task_changes(current_user=Depends(get_current_user)):
+    """
+    Server-sent events for the user's task writes from any device:
+    created/updated/deleted with the task ids (ids is null for large batches),
+    or resync when events were missed. Follow up with GET /tasks/changes.
+    """
+    subscription = task_events.subscribe(str(current_user.id))
+    if subscription is None:
+        raise HTTPException(status_code=429, detail="Too many open task streams")
+    logger.info(f"User {current_user.email} (id={current_user.id}) opened a task stream")
+
+    async def events():
+        try:
+            yield {"event": "ready", "data": "{}"}
+            while True:
+                event = await subscription.queue.get()
+                yield {"event": event["type"], "data": json.dumps(event)}
+        finally:
+            task_events.unsubscribe(subscription)
+            logger.info(f"Task stream closed for user {current_user.email}")
+
+    return EventSourceResponse(events(), ping=settings.TASK_STREAM_HEARTBEAT_SECONDS)
+
+
+@router.get("/export")
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user=Depends(get_current_user),
+):
+    """Stream all of the user's tasks, oldest first, without loading them into memory"""
+    logger.info(f"User {current_user.email} (id={current_user.id}) started a {format} task export")
+    columns = [column for column in EXPORT_COLUMNS if column != "owner_id"]
+    return export_response(stream_task_rows(current_user.id), format, columns, "tasks")
+
+
+@router.post("/import", response_model=TaskImportStatus, status_code=status.HTTP_202_ACCEPTED)
+async def import_tasks(
+    file: UploadFile = File(...),
+    format: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Validate and stage an NDJSON/CSV file (title, description, due_date per
+    row), then merge it into tasks in the background. Poll the returned
+    import for progress and row errors.
+    """
+    try:
+        fmt = detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"User {current_user.email} (id={current_user.id}) is importing tasks from {file.filename} ({fmt})")
+    try:
+        task_limit = settings.FREE_TIER_TASK_LIMIT if current_user.subscription_tier == "free" else None
+        task_import = await crud_imports.create_import(db, current_user.id, file.filename, fmt, task_limit)
+        task_import = await crud_imports.stage_import(db, task_import, iter_records(text_stream(file.file), fmt))
+        if task_import.status == "merging":
+            crud_imports.schedule_import(task_import.id)
+        logger.info(f"Task import {task_import.id} staged {task_import.valid_rows}/{task_import.total_rows} "
+                    f"rows for user {current_user.email}")
+        return task_import
+    except Exception as e:
+        logger.error(f"Failed to import tasks for user {current_user.email}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to import tasks")
+
+
+@router.get("/imports/{import_id}", response_model=TaskImportStatus)
+async def get_task_import(
+    import_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    task_import = await crud_imports.get_import(db, import_id, current_user.id)
+    if not task_import:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return task_import
+
+
+@router.post("/imports/{import_id}/resume", response_model=TaskImportStatus, status_code=status.HTTP_202_ACCEPTED)
+async def resume_task_import(
+    import_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Restart the merge of a stalled import from where it stopped"""
+    task_import = await crud_imports.get_import(db, import_id, current_user.id)
+    if not task_import:
+        raise HTTPException(status_code=404, detail="Import not found")
+    if task_import.status != "merging":
+        raise HTTPException(status_code=409, detail=f"Import is {task_import.status}")
+
+    logger.info(f"User {current_user.email} resumed task import {import_id}")
+    crud_imports.schedule_import(task_import.id)
+    return task_import
+
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task: TaskCreate,
@@ -38,16 +230,14 @@ async def create_task(
 ):
     logger.info(f"User {current_user.email} (id={current_user.id}) is creating a task: {task.title}")
     try:
-        subscription = await crud_auth.get_user_with_subscription(db, current_user.id)
-
-        # free tier restriction
-        if subscription.tier == "free":
-            task_count = await crud_task.count_user_tasks(db, current_user.id)
-            if task_count >= 10:
-                logger.warning(f"User {current_user.email} exceeded free tier task limit (10)")
+        # free tier restriction: counter row stays locked until create_task commits
+        if current_user.subscription_tier == "free":
+            limit = settings.FREE_TIER_TASK_LIMIT
+            if await crud_quota.available_task_slots(db, current_user.id, limit) < 1:
+                logger.warning(f"User {current_user.email} exceeded free tier task limit ({limit})")
                 raise HTTPException(
                     status_code=403,
-                    detail="Free tier users can only create up to 10 tasks"
+                    detail=f"Free tier users can only create up to {limit} tasks"
                 )
 
         new_task = await crud_task.create_task(db, current_user.id, task)
@@ -60,6 +250,95 @@ async def create_task(
         raise HTTPException(status_code=500, detail="Failed to create task")
 
 
+def _check_bulk_size(count: int):
+    if count > settings.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk requests are limited to {settings.TASK_BULK_MAX_ITEMS} items"
+        )
+
+
+def _bulk_report(ids: list, affected: dict, ok: str) -> dict:
+    """Per-id results in request order; ids not affected were not found for this owner"""
+    ids = list(dict.fromkeys(ids))
+    results = [
+        {"id": task_id, "result": ok, "task": affected[task_id]} if task_id in affected
+        else {"id": task_id, "result": "not_found"}
+        for task_id in ids
+    ]
+    succeeded = sum(1 for task_id in ids if task_id in affected)
+    return {"succeeded": succeeded, "failed": len(ids) - succeeded, "results": results}
+
+
+@router.post("/bulk", response_model=TaskBulkResult, status_code=status.HTTP_201_CREATED)
+async def bulk_create_tasks(
+    payload: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _check_bulk_size(len(payload.tasks))
+    logger.info(f"User {current_user.email} (id={current_user.id}) is bulk creating {len(payload.tasks)} tasks")
+    try:
+        # free tier restriction applies to the batch as a whole
+        if current_user.subscription_tier == "free":
+            limit = settings.FREE_TIER_TASK_LIMIT
+            available = await crud_quota.available_task_slots(db, current_user.id, limit)
+            if len(payload.tasks) > available:
+                logger.warning(f"User {current_user.email} bulk create of {len(payload.tasks)} exceeds "
+                               f"free tier limit ({available} slots left)")
+                raise HTTPException(
+                    status_code=403,
+                    detail=f"Free tier users can only create up to {limit} tasks ({available} remaining)"
+                )
+
+        created = await crud_task.bulk_create_tasks(db, current_user.id, payload.tasks)
+        logger.info(f"Bulk created {len(created)} tasks for user {current_user.email}")
+        return {
+            "succeeded": len(created),
+            "failed": 0,
+            "results": [{"id": task.id, "result": "created", "task": task} for task in created],
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to bulk create tasks for user {current_user.email}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to create tasks")
+
+
+@router.patch("/bulk/status", response_model=TaskBulkResult)
+async def bulk_update_task_status(
+    payload: TaskBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _check_bulk_size(len(payload.ids))
+    logger.info(f"User {current_user.email} bulk updating {len(payload.ids)} tasks -> {payload.status}")
+    try:
+        updated = await crud_task.bulk_update_task_status(db, current_user.id, payload.ids, payload.status)
+        logger.info(f"Bulk updated {len(updated)} tasks to {payload.status} for user {current_user.email}")
+        return _bulk_report(payload.ids, {task.id: task for task in updated}, "updated")
+    except Exception as e:
+        logger.error(f"Failed to bulk update tasks for user {current_user.email}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to update tasks")
+
+
+@router.post("/bulk/delete", response_model=TaskBulkResult)
+async def bulk_delete_tasks(
+    payload: TaskBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _check_bulk_size(len(payload.ids))
+    logger.info(f"User {current_user.email} bulk deleting {len(payload.ids)} tasks")
+    try:
+        deleted = await crud_task.bulk_delete_tasks(db, current_user.id, payload.ids)
+        logger.info(f"Bulk deleted {len(deleted)} tasks for user {current_user.email}")
+        return _bulk_report(payload.ids, {task_id: None for task_id in deleted}, "deleted")
+    except Exception as e:
+        logger.error(f"Failed to bulk delete tasks for user {current_user.email}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to delete tasks")
+
+
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: uuid.UUID,
@@ -69,12 +348,11 @@ async def update_task(
 ):
     logger.info(f"User {current_user.email} updating task {task_id}")
     try:
-        db_task = await crud_task.get_task(db, task_id, current_user.id)
-        if not db_task:
+        updated_task = await crud_task.update_task(db, task_id, current_user.id, updates)
+        if not updated_task:
             logger.warning(f"Task {task_id} not found for user {current_user.email}")
             raise HTTPException(status_code=404, detail="Task not found")
 
-        updated_task = await crud_task.update_task(db, db_task, updates)
         logger.info(f"Task {task_id} updated successfully for user {current_user.email}")
         return updated_task
     except HTTPException:
@@ -93,12 +371,11 @@ async def update_task_status(
 ):
     logger.info(f"User {current_user.email} updating task {task_id} status -> {status}")
     try:
-        db_task = await crud_task.get_task(db, task_id, current_user.id)
-        if not db_task:
+        updated_task = await crud_task.update_task_status(db, task_id, current_user.id, status)
+        if not updated_task:
             logger.warning(f"Task {task_id} not found for user {current_user.email}")
             raise HTTPException(status_code=404, detail="Task not found")
 
-        updated_task = await crud_task.update_task_status(db, db_task, status)
         logger.info(f"Task {task_id} status updated to {status} for user {current_user.email}")
         return updated_task
     except HTTPException:
@@ -116,12 +393,10 @@ async def delete_task(
 ):
     logger.info(f"User {current_user.email} deleting task {task_id}")
     try:
-        db_task = await crud_task.get_task(db, task_id, current_user.id)
-        if not db_task:
+        if not await crud_task.delete_task(db, task_id, current_user.id):
             logger.warning(f"Task {task_id} not found for user {current_user.email}")
             raise HTTPException(status_code=404, detail="Task not found")
 
-        await crud_task.delete_task(db, db_task)
         logger.info(f"Task {task_id} deleted successfully for user {current_user.email}")
         return JSONResponse(
             status_code=status.HTTP_204_NO_CONTENT,
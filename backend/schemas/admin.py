@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class ProvisionRowResult(BaseModel):
+    row: int
+    status: str  # created | exists | duplicate | invalid | failed
+    email: Optional[str] = None
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ProvisionReport(BaseModel):
+    total: int
+    created: int
+    exists: int
+    rejected: int
+    results: List[ProvisionRowResult]
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 from uuid import UUID
 from enums.task_status import TaskStatus
@@ -19,8 +19,86 @@ class TaskResponse(TaskBase):
     id: UUID
     status: TaskStatus
     created_at: datetime
+    updated_at: Optional[datetime] = None
     start_at: Optional[datetime]
     end_at: Optional[datetime]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TaskFieldsResponse(BaseModel):
+    """A listed task: `fields=` picks the columns, so only id is always present"""
+    id: UUID
+    title: Optional[str] = None
+    description: Optional[str] = None
+    due_date: Optional[datetime] = None
+    status: Optional[TaskStatus] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    start_at: Optional[datetime] = None
+    end_at: Optional[datetime] = None
+
+class TaskPage(BaseModel):
+    items: List[TaskFieldsResponse]
+    next_cursor: Optional[str] = None
+
+
+class TaskChange(BaseModel):
+    id: UUID
+    deleted: bool = False
+    changed_at: datetime
+    task: Optional[TaskFieldsResponse] = None
+
+
+class TaskChangePage(BaseModel):
+    changes: List[TaskChange]
+    next_cursor: str
+    has_more: bool
+
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1)
+
+
+class TaskBulkStatusUpdate(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1)
+    status: TaskStatus
+
+
+class TaskBulkDelete(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1)
+
+
+class TaskBulkItemResult(BaseModel):
+    id: UUID
+    result: Literal["created", "updated", "deleted", "not_found"]
+    task: Optional[TaskResponse] = None
+
+
+class TaskBulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBulkItemResult]
+
+
+class TaskImportError(BaseModel):
+    row: int
+    error: str
+
+
+class TaskImportStatus(BaseModel):
+    id: UUID
+    status: Literal["staging", "merging", "completed", "failed"]
+    filename: Optional[str] = None
+    total_rows: int
+    valid_rows: int
+    invalid_rows: int
+    imported_rows: int
+    skipped_rows: int
+    errors: List[TaskImportError]
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -17,12 +17,22 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class Principal(UserResponse):
+    """Authenticated user snapshot resolved once per token and cached per worker"""
+    subscription_tier: str = "free"
+    token_version: int = 0
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
-class TokenResponse(BaseModel):
+class AccessTokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+
+class TokenResponse(BaseModel):
+    access_token: str | None = None  # omitted by /auth/me outside the refresh window
+    token_type: str = "bearer"
     user: UserResponse
-    subscription_tier: str
\ No newline at end of file
+    subscription_tier: str
+    task_count: int | None = None  # server-side total for the free tier quota
\ No newline at end of file
@@ -1,20 +1,64 @@
+import asyncio
 import logging
-from fastapi import FastAPI, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from config.api import settings
+from config.database import all_pool_stats, all_statement_stats, current_wal_lsn, replica_engine, request_writes
 from config.log import setup_logging
+from crud.archive import archive_completed_tasks
+from crud.imports import resume_pending_imports
+from crud.partitions import ensure_task_partitions
 from routes.api import router as api_router
+from Security.cache import principal_cache
+from Security.deps import password_hasher
+from Security.revocation import PRINCIPAL_CHANNEL, forget_principals, principal_changed, token_versions
+from Security.token import READ_MARKER_HEADER, create_read_marker
+from utils.periodic import run_periodically
+from utils.task_events import task_events
 
 
 # Setup logging based on environment
 setup_logging(env=settings.APP_ENV)
 logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop per-worker background resources"""
+    try:
+        resumed = await resume_pending_imports()
+        if resumed:
+            logger.info(f"Resumed {resumed} unfinished task imports")
+    except Exception as e:
+        logger.error(f"Could not resume task imports: {str(e)}", exc_info=True)
+    # Principal and token version caches are per worker: other workers'
+    # changes arrive on the task_events LISTEN connection
+    task_events.listen(PRINCIPAL_CHANNEL, principal_changed, forget_principals)
+    task_events.start()
+    jobs = [
+        asyncio.create_task(run_periodically(
+            "task partitions", settings.TASK_PARTITION_CHECK_SECONDS, ensure_task_partitions
+        )),
+        asyncio.create_task(run_periodically(
+            "task archival", settings.TASK_ARCHIVE_INTERVAL_SECONDS, archive_completed_tasks
+        )),
+    ]
+    yield
+    for job in jobs:
+        job.cancel()
+    await asyncio.gather(*jobs, return_exceptions=True)
+    await task_events.stop()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.DESCRIPTION,
     version=settings.VERSION,
+    lifespan=lifespan,
 )
 
 
@@ -25,9 +69,30 @@ app.add_middleware(
     allow_credentials = True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", READ_MARKER_HEADER],
 )
 
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """
+    With a replica, a response to a request that committed a write carries a
+    read marker; reads that send it back stay on the primary until the
+    replica has replayed that write, on whichever worker serves them.
+    """
+    if replica_engine is None:
+        return await call_next(request)
+    writes = {}
+    request_writes.set(writes)
+    response = await call_next(request)
+    if writes.get("committed"):
+        try:
+            response.headers[READ_MARKER_HEADER] = create_read_marker(await current_wal_lsn())
+        except Exception as e:
+            logger.warning(f"Could not attach read marker: {str(e)}")
+    return response
+
+
 @app.get("/health",  tags=["Health"])
 def get_server_health() -> JSONResponse:
     """
@@ -39,4 +104,25 @@ def get_server_health() -> JSONResponse:
         status_code=status.HTTP_200_OK,
         content={"message": "Server is healthy"},
     )
+
+
+@app.get("/metrics", tags=["Health"])
+def get_server_metrics() -> JSONResponse:
+    """
+    In-process runtime metrics for this worker.
+    Used to size caches and pools; values are per uvicorn worker.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "principal_cache": principal_cache.stats(),
+            "password_hasher": password_hasher.stats(),
+            "token_versions": token_versions.stats(),
+            "task_events": task_events.stats(),
+            "db_pools": all_pool_stats(),
+            "db_statements": all_statement_stats(),
+        },
+    )
+
+
 app.include_router(api_router)
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+API tests run the app in-process (httpx ASGITransport, no lifespan jobs)
+against the Postgres configured by the usual PG_* settings, migrated to
+head. Each test registers its own throwaway user; deleting it at teardown
+cascades to everything the test created.
+
+    cd backend && alembic upgrade head && pytest
+"""
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import delete, text
+
+from config.database import AsyncSessionLocal, engine
+from models.user import User
+from server import app
+
+PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def database():
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1 FROM task_ids LIMIT 1"))
+    except Exception as e:
+        pytest.skip(f"No migrated database to test against: {e}")
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def login(client, email: str) -> dict:
+    response = await client.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+async def make_user(client):
+    """Register free tier users: {"id", "email", "token", "headers"} each"""
+    created = []
+
+    async def make() -> dict:
+        email = f"test-{uuid.uuid4().hex[:12]}@example.com"
+        response = await client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        created.append(uuid.UUID(response.json()["id"]))
+        token = (await login(client, email))["access_token"]
+        return {
+            "id": created[-1],
+            "email": email,
+            "token": token,
+            "headers": {"Authorization": f"Bearer {token}"},
+        }
+
+    yield make
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.id.in_(created)))
+        await session.commit()
+
+
+@pytest.fixture
+async def user(make_user):
+    return await make_user()
+
+
+@pytest.fixture
+async def other_user(make_user):
+    return await make_user()
+
+
+@pytest.fixture
+async def premium_user(client, user):
+    """`user` upgraded to premium: no free tier task limit"""
+    response = await client.put("/api/v1/subscriptions/tier", json={"tier": "premium"}, headers=user["headers"])
+    assert response.status_code == 200, response.text
+    token = (await login(client, user["email"]))["access_token"]
+    return {**user, "token": token, "headers": {"Authorization": f"Bearer {token}"}}
+
+
+async def create_tasks(client, account: dict, count: int, **fields) -> list:
+    """Bulk-create `count` tasks titled "Task 0".."Task n-1"; returns their ids in order"""
+    tasks = [{"title": f"Task {n}", **fields} for n in range(count)]
+    response = await client.post("/api/v1/tasks/bulk", json={"tasks": tasks}, headers=account["headers"])
+    assert response.status_code == 201, response.text
+    return [result["id"] for result in response.json()["results"]]
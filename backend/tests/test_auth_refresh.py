@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+from jose import jwt
+
+from config.api import settings
+from Security.token import create_access_token
+
+
+def reissue(token: str, expires_in: timedelta) -> str:
+    """`token` with the same claims but a different expiry"""
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    return create_access_token(
+        data={"sub": payload["sub"]},
+        expires_delta=expires_in,
+        tier=payload["tier"],
+        token_version=payload["ver"],
+    )
+
+
+def expiry(token: str) -> datetime:
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    return datetime.utcfromtimestamp(payload["exp"])
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def test_me_keeps_a_fresh_token(client, user):
+    response = await client.get("/api/v1/auth/me", headers=user["headers"])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "access_token" not in body
+    assert body["user"]["email"] == user["email"]
+    assert body["subscription_tier"] == "free"
+    assert body["task_count"] == 0
+
+
+async def test_me_reissues_inside_the_refresh_window(client, user):
+    window = timedelta(minutes=settings.ACCESS_TOKEN_REFRESH_WINDOW_MINUTES)
+    token = reissue(user["token"], window - timedelta(minutes=5))
+
+    response = await client.get("/api/v1/auth/me", headers=bearer(token))
+
+    assert response.status_code == 200
+    new_token = response.json()["access_token"]
+    assert expiry(new_token) - datetime.utcnow() > window
+
+
+async def test_me_keeps_a_token_just_outside_the_window(client, user):
+    window = timedelta(minutes=settings.ACCESS_TOKEN_REFRESH_WINDOW_MINUTES)
+    token = reissue(user["token"], window + timedelta(minutes=5))
+
+    response = await client.get("/api/v1/auth/me", headers=bearer(token))
+
+    assert response.status_code == 200
+    assert "access_token" not in response.json()
+
+
+async def test_refresh_always_issues_a_full_lifetime_token(client, user):
+    token = reissue(user["token"], timedelta(days=1))
+
+    response = await client.post("/api/v1/auth/refresh", headers=bearer(token))
+
+    assert response.status_code == 200
+    new_token = response.json()["access_token"]
+    lifetime = expiry(new_token) - datetime.utcnow()
+    assert lifetime > timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES - 1)
+
+
+async def test_expired_token_cannot_be_refreshed(client, user):
+    token = reissue(user["token"], timedelta(seconds=-1))
+
+    assert (await client.get("/api/v1/auth/me", headers=bearer(token))).status_code == 401
+    assert (await client.post("/api/v1/auth/refresh", headers=bearer(token))).status_code == 401
@@ -0,0 +1,102 @@
+import uuid
+
+from config.api import settings
+from conftest import create_tasks
+
+
+def results_by_id(body: dict) -> dict:
+    return {result["id"]: result for result in body["results"]}
+
+
+async def test_bulk_status_reports_each_id(client, user, other_user):
+    mine = await create_tasks(client, user, 2)
+    theirs = await create_tasks(client, other_user, 1)
+    missing = str(uuid.uuid4())
+    ids = [mine[0], theirs[0], missing, mine[1], mine[0]]
+
+    response = await client.patch(
+        "/api/v1/tasks/bulk/status", json={"ids": ids, "status": "completed"}, headers=user["headers"]
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    # Request order, duplicates reported once
+    assert [result["id"] for result in body["results"]] == [mine[0], theirs[0], missing, mine[1]]
+    results = results_by_id(body)
+    assert results[mine[0]]["result"] == "updated"
+    assert results[mine[0]]["task"]["status"] == "completed"
+    assert results[mine[0]]["task"]["end_at"] is not None
+    assert results[theirs[0]] == {"id": theirs[0], "result": "not_found", "task": None}
+    assert results[missing]["result"] == "not_found"
+
+    response = await client.get("/api/v1/tasks/", headers=other_user["headers"])
+    assert [task["status"] for task in response.json()["items"]] == ["todo"]
+
+
+async def test_bulk_delete_reports_each_id(client, user, other_user):
+    mine = await create_tasks(client, user, 2)
+    theirs = await create_tasks(client, other_user, 1)
+
+    response = await client.post(
+        "/api/v1/tasks/bulk/delete", json={"ids": [*mine, theirs[0]]}, headers=user["headers"]
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    results = results_by_id(body)
+    assert [results[task_id]["result"] for task_id in mine] == ["deleted", "deleted"]
+    assert results[theirs[0]]["result"] == "not_found"
+
+    response = await client.get("/api/v1/tasks/", headers=other_user["headers"])
+    assert [task["id"] for task in response.json()["items"]] == theirs
+
+    # Already gone: the second delete finds nothing
+    response = await client.post("/api/v1/tasks/bulk/delete", json={"ids": mine}, headers=user["headers"])
+    assert (response.json()["succeeded"], response.json()["failed"]) == (0, 2)
+
+
+async def test_bulk_create_returns_tasks_in_request_order(client, user):
+    tasks = [{"title": title} for title in ("b", "a", "c")]
+
+    response = await client.post("/api/v1/tasks/bulk", json={"tasks": tasks}, headers=user["headers"])
+
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (3, 0)
+    assert [result["task"]["title"] for result in body["results"]] == ["b", "a", "c"]
+
+
+async def test_bulk_create_beyond_the_free_tier_creates_nothing(client, user):
+    await create_tasks(client, user, settings.FREE_TIER_TASK_LIMIT - 1)
+    tasks = [{"title": "one too many"}] * 2
+
+    response = await client.post("/api/v1/tasks/bulk", json={"tasks": tasks}, headers=user["headers"])
+
+    assert response.status_code == 403
+    response = await client.get("/api/v1/auth/me", headers=user["headers"])
+    assert response.json()["task_count"] == settings.FREE_TIER_TASK_LIMIT - 1
+
+
+async def test_bulk_size_is_capped(client, user):
+    ids = [str(uuid.uuid4()) for _ in range(settings.TASK_BULK_MAX_ITEMS + 1)]
+
+    response = await client.post("/api/v1/tasks/bulk/delete", json={"ids": ids}, headers=user["headers"])
+
+    assert response.status_code == 413
+
+
+async def test_single_task_mutations_are_owner_scoped(client, user, other_user):
+    theirs = (await create_tasks(client, other_user, 1))[0]
+
+    response = await client.put(f"/api/v1/tasks/{theirs}", json={"title": "mine now"}, headers=user["headers"])
+    assert response.status_code == 404
+    response = await client.patch(f"/api/v1/tasks/{theirs}/completed", headers=user["headers"])
+    assert response.status_code == 404
+    response = await client.delete(f"/api/v1/tasks/{theirs}", headers=user["headers"])
+    assert response.status_code == 404
+
+    response = await client.get("/api/v1/tasks/", headers=other_user["headers"])
+    task = response.json()["items"][0]
+    assert (task["id"], task["title"], task["status"]) == (theirs, "Task 0", "todo")
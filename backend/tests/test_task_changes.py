@@ -0,0 +1,112 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+
+from config.database import AsyncSessionLocal, engine
+from crud.archive import archive_batch
+from models.task import Task
+from models.task_tombstone import TaskTombstone
+from utils.cursor import encode_cursor
+from conftest import create_tasks
+
+
+async def sync(client, account: dict, since: str | None = None, **params) -> dict:
+    query = {**params, **({"since": since} if since else {})}
+    response = await client.get("/api/v1/tasks/changes", params=query, headers=account["headers"])
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def sync_all(client, account: dict, since: str | None = None, limit: int = 100) -> tuple:
+    """Every change after `since`, following next_cursor; returns (changes, cursor)"""
+    changes = []
+    while True:
+        page = await sync(client, account, since, limit=limit)
+        changes += page["changes"]
+        since = page["next_cursor"]
+        if not page["has_more"]:
+            return changes, since
+
+
+async def test_sync_returns_writes_and_deletions_after_the_cursor(client, user):
+    ids = await create_tasks(client, user, 3)
+    changes, cursor = await sync_all(client, user)
+    assert sorted(change["id"] for change in changes) == sorted(ids)
+    assert not any(change["deleted"] for change in changes)
+
+    # Nothing new: empty page, same cursor
+    page = await sync(client, user, cursor)
+    assert (page["changes"], page["next_cursor"], page["has_more"]) == ([], cursor, False)
+
+    await client.put(f"/api/v1/tasks/{ids[0]}", json={"title": "renamed"}, headers=user["headers"])
+    await client.delete(f"/api/v1/tasks/{ids[1]}", headers=user["headers"])
+
+    changes, _ = await sync_all(client, user, cursor)
+    assert [(change["id"], change["deleted"]) for change in changes] == [(ids[0], False), (ids[1], True)]
+    assert changes[0]["task"]["title"] == "renamed"
+    assert changes[1]["task"] is None
+
+
+async def test_pages_resume_without_gaps(client, user):
+    ids = await create_tasks(client, user, 3) + await create_tasks(client, user, 4)
+    await client.post("/api/v1/tasks/bulk/delete", json={"ids": ids[:2]}, headers=user["headers"])
+
+    changes, _ = await sync_all(client, user, limit=2)
+
+    # One entry per task: the deleted ones only as tombstones
+    assert sorted(change["id"] for change in changes) == sorted(ids)
+    assert {change["id"] for change in changes if change["deleted"]} == set(ids[:2])
+
+
+async def test_changes_wait_for_older_transactions(client, user):
+    _, cursor = await sync_all(client, user)
+
+    async with engine.connect() as conn:
+        # An older transaction with an id, still running
+        await conn.execute(select(func.pg_current_xact_id()))
+        task_id = (await create_tasks(client, user, 1))[0]
+
+        # Committed, but behind the open transaction: held back, not skipped
+        page = await sync(client, user, cursor)
+        assert (page["changes"], page["next_cursor"]) == ([], cursor)
+        await conn.rollback()
+
+    changes, _ = await sync_all(client, user, cursor)
+    assert [change["id"] for change in changes] == [task_id]
+
+
+async def test_archived_tasks_are_not_reported_deleted(client, user):
+    task_id = (await create_tasks(client, user, 1))[0]
+    await client.patch(f"/api/v1/tasks/{task_id}/completed", headers=user["headers"])
+    async with AsyncSessionLocal() as session:
+        # Older than anything else in the database, so only this task is archived
+        await session.execute(update(Task).where(Task.id == uuid.UUID(task_id)).values(updated_at=datetime(2000, 1, 1)))
+        await session.commit()
+    _, cursor = await sync_all(client, user)
+
+    async with AsyncSessionLocal() as session:
+        assert await archive_batch(session, datetime(2000, 1, 2), 10) == 1
+
+    assert (await sync(client, user, cursor))["changes"] == []
+    async with AsyncSessionLocal() as session:
+        tombstone = await session.get(TaskTombstone, uuid.UUID(task_id))
+        assert tombstone is None
+
+    response = await client.get("/api/v1/tasks/", params={"include_archived": "true"}, headers=user["headers"])
+    assert [task["id"] for task in response.json()["items"]] == [task_id]
+    response = await client.get("/api/v1/tasks/", headers=user["headers"])
+    assert response.json()["items"] == []
+
+
+async def test_legacy_timestamp_cursor_restarts_the_sync(client, user):
+    ids = await create_tasks(client, user, 2)
+    legacy = encode_cursor(["changes", datetime.utcnow().isoformat(), str(uuid.uuid4())])
+
+    changes, _ = await sync_all(client, user, legacy)
+
+    assert sorted(change["id"] for change in changes) == sorted(ids)
+    response = await client.get(
+        "/api/v1/tasks/changes", params={"since": "not-a-cursor"}, headers=user["headers"]
+    )
+    assert response.status_code == 400
@@ -0,0 +1,61 @@
+from conftest import create_tasks
+
+
+async def list_tasks(client, account: dict, etag: str | None = None, **params):
+    headers = {**account["headers"], **({"If-None-Match": etag} if etag else {})}
+    return await client.get("/api/v1/tasks/", params=params, headers=headers)
+
+
+async def test_unchanged_list_is_not_modified(client, user):
+    await create_tasks(client, user, 2)
+    first = await list_tasks(client, user)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert etag.startswith('W/"')
+
+    response = await list_tasks(client, user, etag)
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+async def test_every_kind_of_write_changes_the_etag(client, user):
+    task_id = (await create_tasks(client, user, 1))[0]
+    writes = [
+        lambda: client.post("/api/v1/tasks/", json={"title": "new"}, headers=user["headers"]),
+        lambda: client.put(f"/api/v1/tasks/{task_id}", json={"title": "renamed"}, headers=user["headers"]),
+        lambda: client.patch(f"/api/v1/tasks/{task_id}/in_progress", headers=user["headers"]),
+        lambda: client.patch(
+            "/api/v1/tasks/bulk/status", json={"ids": [task_id], "status": "completed"}, headers=user["headers"]
+        ),
+        lambda: client.delete(f"/api/v1/tasks/{task_id}", headers=user["headers"]),
+    ]
+    etag = (await list_tasks(client, user)).headers["ETag"]
+    for write in writes:
+        assert (await write()).status_code < 300
+
+        response = await list_tasks(client, user, etag)
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        etag = response.headers["ETag"]
+
+
+async def test_etag_is_scoped_to_the_query_and_the_user(client, user, other_user):
+    etag = (await list_tasks(client, user, limit=5)).headers["ETag"]
+
+    assert (await list_tasks(client, user, etag, limit=6)).status_code == 200
+    assert (await list_tasks(client, user, etag, limit=5, status="todo")).status_code == 200
+    # Both collections are at version 0: only the user id tells them apart
+    assert (await list_tasks(client, other_user, etag, limit=5)).status_code == 200
+
+
+async def test_if_none_match_uses_weak_comparison(client, user):
+    etag = (await list_tasks(client, user)).headers["ETag"]
+    strong = etag.removeprefix("W/")
+
+    assert (await list_tasks(client, user, strong)).status_code == 304
+    assert (await list_tasks(client, user, f'W/"0-stale", {etag}')).status_code == 304
+    assert (await list_tasks(client, user, "*")).status_code == 304
+    assert (await list_tasks(client, user, 'W/"0-stale"')).status_code == 200
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from config.api import settings
+from config.database import AsyncSessionLocal
+from crud import imports as crud_imports
+from models.task import Task
+from models.task_import import TaskImportRow
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    """Several merge chunks per import, no pause between them"""
+    monkeypatch.setattr(settings, "TASK_IMPORT_MERGE_CHUNK_SIZE", 3)
+    monkeypatch.setattr(settings, "TASK_IMPORT_THROTTLE_SECONDS", 0)
+
+
+def ndjson(*records) -> bytes:
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+
+async def upload(client, account: dict, content: bytes, filename: str = "tasks.ndjson") -> dict:
+    response = await client.post(
+        "/api/v1/tasks/import", files={"file": (filename, content)}, headers=account["headers"]
+    )
+    assert response.status_code == 202, response.text
+    return response.json()
+
+
+async def wait_for_import(client, account: dict, import_id: str) -> dict:
+    for _ in range(200):
+        response = await client.get(f"/api/v1/tasks/imports/{import_id}", headers=account["headers"])
+        if response.json()["status"] in ("completed", "failed"):
+            return response.json()
+        await asyncio.sleep(0.05)
+    pytest.fail(f"Import {import_id} did not finish")
+
+
+async def count_tasks(owner_id) -> int:
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(
+            select(func.count()).select_from(Task).where(Task.owner_id == owner_id)
+        )).scalar_one()
+
+
+async def stage(owner_id, count: int):
+    """An import staged but not merged yet, as a crashed worker leaves it"""
+    records = [(n, {"title": f"Imported {n}"}, None) for n in range(1, count + 1)]
+    async with AsyncSessionLocal() as session:
+        task_import = await crud_imports.create_import(session, owner_id, "tasks.ndjson", "ndjson", None)
+        return await crud_imports.stage_import(session, task_import, records)
+
+
+async def test_import_merges_valid_rows_and_reports_the_rest(client, premium_user):
+    content = ndjson(*({"title": f"Imported {n}"} for n in range(7)), {"description": "no title"})
+    content += b"\nnot json"
+
+    task_import = await wait_for_import(client, premium_user, (await upload(client, premium_user, content))["id"])
+
+    assert task_import["status"] == "completed"
+    assert (task_import["total_rows"], task_import["valid_rows"], task_import["invalid_rows"]) == (9, 7, 2)
+    assert task_import["imported_rows"] == 7
+    assert [error["row"] for error in task_import["errors"]] == [8, 9]
+    assert await count_tasks(premium_user["id"]) == 7
+
+
+async def test_rerunning_an_import_inserts_nothing_twice(client, premium_user):
+    task_import = await stage(premium_user["id"], 8)
+
+    # Two workers resuming it at once, then once more after it finished
+    await asyncio.gather(crud_imports.run_import(task_import.id), crud_imports.run_import(task_import.id))
+    await crud_imports.run_import(task_import.id)
+
+    status = await wait_for_import(client, premium_user, str(task_import.id))
+    assert (status["status"], status["imported_rows"]) == ("completed", 8)
+    assert await count_tasks(premium_user["id"]) == 8
+
+    response = await client.post(f"/api/v1/tasks/imports/{task_import.id}/resume", headers=premium_user["headers"])
+    assert response.status_code == 409
+
+
+async def test_resume_skips_rows_merged_before_the_crash(client, premium_user):
+    task_import = await stage(premium_user["id"], 8)
+    async with AsyncSessionLocal() as session:
+        # Row 4 reached tasks (under its staged id) before progress was lost
+        task_id = (await session.execute(
+            select(TaskImportRow.task_id).where(TaskImportRow.import_id == task_import.id, TaskImportRow.seq == 4)
+        )).scalar_one()
+        await session.execute(insert(Task).values(id=task_id, owner_id=premium_user["id"], title="Imported 4"))
+        await session.commit()
+
+    await crud_imports.run_import(task_import.id)
+
+    status = await wait_for_import(client, premium_user, str(task_import.id))
+    assert (status["status"], status["imported_rows"]) == ("completed", 7)
+    assert await count_tasks(premium_user["id"]) == 8
+
+
+async def test_free_tier_import_stops_at_the_limit(client, user):
+    content = ndjson(*({"title": f"Imported {n}"} for n in range(settings.FREE_TIER_TASK_LIMIT + 4)))
+
+    task_import = await wait_for_import(client, user, (await upload(client, user, content))["id"])
+
+    assert task_import["status"] == "completed"
+    assert (task_import["imported_rows"], task_import["skipped_rows"]) == (settings.FREE_TIER_TASK_LIMIT, 4)
+    assert task_import["error"] is not None
+    assert await count_tasks(user["id"]) == settings.FREE_TIER_TASK_LIMIT
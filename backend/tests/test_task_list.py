@@ -0,0 +1,88 @@
+import pytest
+
+from conftest import create_tasks
+
+
+async def walk(client, account: dict, **params) -> list:
+    """Every page of GET /tasks, following next_cursor to the end"""
+    items, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/tasks/", params=query, headers=account["headers"])
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["items"]) <= params["limit"]
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_pages_cover_every_task_once_in_order(client, premium_user, order):
+    # Two batches reuse the same titles: ties are broken by id
+    ids = await create_tasks(client, premium_user, 13) + await create_tasks(client, premium_user, 12)
+
+    items = await walk(client, premium_user, sort="title", order=order, limit=10)
+
+    assert sorted(item["id"] for item in items) == sorted(ids)
+    keys = [(item["title"], item["id"]) for item in items]
+    assert keys == sorted(keys, reverse=(order == "desc"))
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_pages_cross_the_null_segment(client, premium_user, order):
+    dated = await create_tasks(client, premium_user, 7, due_date="2026-01-01T00:00:00")
+    undated = await create_tasks(client, premium_user, 8)
+
+    items = await walk(client, premium_user, sort="due", order=order, limit=3)
+
+    # Postgres order: NULLs last ascending, first descending; ties by id
+    descending = order == "desc"
+    dated, undated = sorted(dated, reverse=descending), sorted(undated, reverse=descending)
+    expected = undated + dated if descending else dated + undated
+    assert [item["id"] for item in items] == expected
+
+
+async def test_filters_hold_across_pages(client, premium_user):
+    ids = await create_tasks(client, premium_user, 9)
+    response = await client.patch(
+        "/api/v1/tasks/bulk/status", json={"ids": ids[:5], "status": "completed"}, headers=premium_user["headers"]
+    )
+    assert response.status_code == 200
+
+    items = await walk(client, premium_user, status="completed", sort="created", order="desc", limit=2)
+
+    assert sorted(item["id"] for item in items) == sorted(ids[:5])
+
+
+async def test_cursor_is_bound_to_its_sort(client, premium_user):
+    await create_tasks(client, premium_user, 3)
+    response = await client.get(
+        "/api/v1/tasks/", params={"sort": "title", "limit": 1}, headers=premium_user["headers"]
+    )
+    cursor = response.json()["next_cursor"]
+
+    response = await client.get(
+        "/api/v1/tasks/", params={"sort": "due", "limit": 1, "cursor": cursor}, headers=premium_user["headers"]
+    )
+    assert response.status_code == 400
+
+    response = await client.get(
+        "/api/v1/tasks/", params={"cursor": "not-a-cursor"}, headers=premium_user["headers"]
+    )
+    assert response.status_code == 400
+
+
+async def test_sparse_items_match_the_documented_schema(client, premium_user):
+    await create_tasks(client, premium_user, 2)
+    response = await client.get(
+        "/api/v1/tasks/", params={"fields": "id,title"}, headers=premium_user["headers"]
+    )
+    items = response.json()["items"]
+    assert all(set(item) == {"id", "title", "created_at"} for item in items)
+
+    schemas = (await client.get("/openapi.json")).json()["components"]["schemas"]
+    item_schema = schemas["TaskPage"]["properties"]["items"]["items"]["$ref"].rsplit("/", 1)[-1]
+    assert schemas[item_schema]["required"] == ["id"]
+    assert set(items[0]) <= set(schemas[item_schema]["properties"])
@@ -0,0 +1,30 @@
+from config.api import settings
+from conftest import create_tasks
+
+
+async def task_count(client, account: dict) -> int:
+    return (await client.get("/api/v1/auth/me", headers=account["headers"])).json()["task_count"]
+
+
+async def test_free_tier_limit_follows_the_task_count(client, user):
+    ids = await create_tasks(client, user, settings.FREE_TIER_TASK_LIMIT)
+    assert await task_count(client, user) == settings.FREE_TIER_TASK_LIMIT
+
+    response = await client.post("/api/v1/tasks/", json={"title": "over"}, headers=user["headers"])
+    assert response.status_code == 403
+
+    assert (await client.delete(f"/api/v1/tasks/{ids[0]}", headers=user["headers"])).status_code == 204
+    assert await task_count(client, user) == settings.FREE_TIER_TASK_LIMIT - 1
+
+    response = await client.post("/api/v1/tasks/", json={"title": "fits again"}, headers=user["headers"])
+    assert response.status_code == 201
+    assert await task_count(client, user) == settings.FREE_TIER_TASK_LIMIT
+
+
+async def test_premium_users_are_not_limited(client, premium_user):
+    await create_tasks(client, premium_user, settings.FREE_TIER_TASK_LIMIT)
+
+    response = await client.post("/api/v1/tasks/", json={"title": "more"}, headers=premium_user["headers"])
+
+    assert response.status_code == 201
+    assert await task_count(client, premium_user) == settings.FREE_TIER_TASK_LIMIT + 1
@@ -0,0 +1,20 @@
+import hashlib
+
+
+def make_etag(version: int, *scope: str) -> str:
+    """
+    Weak ETag for a versioned collection. `scope` (user id, query string...)
+    distinguishes different views of the same collection version.
+    """
+    digest = hashlib.blake2s("|".join(scope).encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """RFC 9110 weak comparison against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
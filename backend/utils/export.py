@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Dict, List
+
+from fastapi.responses import StreamingResponse
+
+from utils.serialize import plain_value
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def encode_rows(
+    rows: AsyncIterator[Dict],
+    fmt: str,
+    columns: List[str],
+    batch_size: int = 500,
+) -> AsyncIterator[bytes]:
+    """
+    Encode mappings as NDJSON lines or CSV rows, flushing one chunk per
+    `batch_size` rows so only a single chunk is ever held in memory.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+
+    pending = 0
+    async for row in rows:
+        values = [plain_value(row[column]) for column in columns]
+        if writer is not None:
+            writer.writerow(["" if value is None else value for value in values])
+        else:
+            buffer.write(json.dumps(dict(zip(columns, values)), separators=(",", ":")))
+            buffer.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(rows: AsyncIterator[Dict], fmt: str, columns: List[str], filename: str) -> StreamingResponse:
+    """Stream `rows` as a downloadable NDJSON/CSV attachment"""
+    return StreamingResponse(
+        encode_rows(rows, fmt, columns),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
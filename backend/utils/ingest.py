@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from typing import IO, Iterator, Tuple
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+
+def detect_format(filename: str | None, explicit: str | None = None) -> str:
+    """Resolve the upload format from an explicit value or the file extension"""
+    if explicit:
+        fmt = explicit.lower()
+    elif filename and filename.lower().endswith(".csv"):
+        fmt = "csv"
+    else:
+        fmt = "ndjson"
+
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of {', '.join(SUPPORTED_FORMATS)}")
+    return fmt
+
+
+def text_stream(binary: IO[bytes]) -> IO[str]:
+    """Wrap an uploaded binary file so it can be read line by line"""
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, dict | None, str | None]]:
+    """
+    Lazily yield (row_number, record, error) for each data row.
+    Row numbers are 1-based and exclude the CSV header; blank lines are skipped.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row_number, row in enumerate(reader, start=1):
+            # csv gives "" for empty cells; treat them as missing
+            yield row_number, {k: v for k, v in row.items() if k and v != ""}, None
+        return
+
+    row_number = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, "Each line must be a JSON object"
+            continue
+        yield row_number, record, None
+
+
+def first_error_message(exc: Exception) -> str:
+    """Compact message for a pydantic ValidationError (or any exception)"""
+    errors = getattr(exc, "errors", None)
+    if callable(errors):
+        details = errors()
+        if details:
+            loc = ".".join(str(part) for part in details[0].get("loc", ()))
+            return f"{loc}: {details[0].get('msg')}" if loc else details[0].get("msg", str(exc))
+    return str(exc)
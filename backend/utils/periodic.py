@@ -0,0 +1,18 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(name: str, interval_seconds: float, job: Callable[[], Awaitable]) -> None:
+    """Run `job` now and then every `interval_seconds` until cancelled; failures are logged"""
+    while True:
+        try:
+            result = await job()
+            logger.info(f"Periodic job '{name}' finished: {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Periodic job '{name}' failed: {str(e)}", exc_info=True)
+        await asyncio.sleep(interval_seconds)
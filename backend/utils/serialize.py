@@ -0,0 +1,47 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterable
+from uuid import UUID
+
+from fastapi import Response
+
+
+def plain_value(value: Any) -> Any:
+    """JSON-ready form of the scalar types stored in our tables"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _default(value: Any) -> Any:
+    converted = plain_value(value)
+    if converted is value:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return converted
+
+
+def rows_to_dicts(rows: Iterable) -> list[Dict[str, Any]]:
+    """Core result rows -> plain dicts keyed by column name"""
+    return [dict(row._mapping) for row in rows]
+
+
+def dump_json(payload: Any) -> bytes:
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode()
+
+
+def json_response(payload: Any, status_code: int = 200, headers: Dict[str, str] | None = None) -> Response:
+    """
+    Serialize straight to bytes, skipping response_model validation.
+    For read paths whose rows already have the response shape.
+    """
+    return Response(
+        content=dump_json(payload),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
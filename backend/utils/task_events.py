@@ -0,0 +1,192 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, Set, Tuple
+
+import asyncpg
+
+from config.api import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task_changes"
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    """One stream client: a bounded queue of events for a single user"""
+
+    def __init__(self, owner_id: str, max_size: int):
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+
+    def offer(self, event: Dict[str, Any]) -> bool:
+        """
+        Enqueue without blocking the listener. A full queue means the client
+        is not keeping up: its backlog is replaced by a single resync event
+        (refetch via /tasks/changes). Returns False when events were dropped.
+        """
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+            return False
+
+
+class TaskEventHub:
+    """
+    Fans task change notifications out to stream subscribers in this worker.
+    A single LISTEN connection per worker receives every pg_notify from the
+    tasks_notify_* triggers; subscribers never hold a database connection.
+    Other per-worker consumers can share that connection through listen().
+    """
+
+    def __init__(self, queue_size: int, max_per_user: int):
+        self.queue_size = queue_size
+        self.max_per_user = max_per_user
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._connection: asyncpg.Connection | None = None
+        self._supervisor: asyncio.Task | None = None
+        self._lost = asyncio.Event()
+        self._channels: Dict[str, Tuple[Callable[[str], None], Callable[[], None]]] = {}
+        self.notifications = 0
+        self.delivered = 0
+        self.resyncs = 0
+        self.reconnects = 0
+
+    # -- subscribers ---------------------------------------------------
+
+    def subscribe(self, owner_id: str) -> Subscription | None:
+        """None when the user already has max_per_user open streams"""
+        subscribers = self._subscribers[owner_id]
+        if len(subscribers) >= self.max_per_user:
+            return None
+        subscription = Subscription(owner_id, self.queue_size)
+        subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.owner_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.owner_id]
+
+    def _broadcast(self, owner_id: str, event: Dict[str, Any]) -> None:
+        for subscription in self._subscribers.get(owner_id, ()):
+            if subscription.offer(event):
+                self.delivered += 1
+            else:
+                self.resyncs += 1
+
+    # -- LISTEN connection ---------------------------------------------
+
+    def listen(self, channel: str, on_payload: Callable[[str], None], on_gap: Callable[[], None]) -> None:
+        """
+        Also pass `channel` payloads to `on_payload`. `on_gap` runs whenever
+        notifications may have been missed: on every (re)connect and when
+        the connection is lost. Register before start().
+        """
+        self._channels[channel] = (on_payload, on_gap)
+
+    def _gap(self) -> None:
+        for _, on_gap in self._channels.values():
+            on_gap()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self.notifications += 1
+        try:
+            event = json.loads(payload)
+            owner_id = event.pop("owner_id")
+        except (ValueError, KeyError):
+            logger.warning(f"Ignoring malformed {CHANNEL} payload: {payload[:200]}")
+            return
+        self._broadcast(owner_id, event)
+
+    def _on_termination(self, connection) -> None:
+        self._lost.set()
+
+    async def _connect(self) -> None:
+        self._connection = await asyncpg.connect(
+            host=settings.PG_HOST,
+            port=settings.PG_PORT,
+            user=settings.PG_USER,
+            password=settings.PG_PASSWORD,
+            database=settings.PG_DB,
+        )
+        self._connection.add_termination_listener(self._on_termination)
+        await self._connection.add_listener(CHANNEL, self._on_notify)
+        for channel, (on_payload, _) in self._channels.items():
+            await self._connection.add_listener(
+                channel, lambda connection, pid, name, payload, on_payload=on_payload: on_payload(payload)
+            )
+        self._lost.clear()
+        self._gap()
+
+    async def _supervise(self) -> None:
+        """Keep the LISTEN connection open, reconnecting with backoff"""
+        delay = 1
+        while True:
+            try:
+                await self._connect()
+                logger.info(f"Listening for {CHANNEL} notifications")
+                delay = 1
+                await self._lost.wait()
+                logger.warning(f"{CHANNEL} listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{CHANNEL} listener failed to connect: {str(e)}")
+            finally:
+                await self._close_connection()
+
+            # Notifications sent while disconnected are gone: tell every client
+            self.reconnects += 1
+            self._gap()
+            for owner_id in list(self._subscribers):
+                self._broadcast(owner_id, RESYNC_EVENT)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    async def _close_connection(self) -> None:
+        if self._connection is not None and not self._connection.is_closed():
+            try:
+                await self._connection.close(timeout=5)
+            except Exception:
+                self._connection.terminate()
+        self._connection = None
+
+    def start(self) -> None:
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "listening": self._connection is not None and not self._connection.is_closed(),
+            "users": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "notifications": self.notifications,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+            "reconnects": self.reconnects,
+        }
+
+
+task_events = TaskEventHub(
+    queue_size=settings.TASK_STREAM_QUEUE_SIZE,
+    max_per_user=settings.TASK_STREAM_MAX_PER_USER,
+)
@@ -32,4 +32,16 @@ export const verify_token = async () => {
     } catch (err) {
       return { error: err };
     }
-  };
\ No newline at end of file
+  };
+
+export const refresh_token = async () => {
+    try {
+      const data = await axiosInstance.post("/auth/refresh");
+      if (data.access_token) {
+        storeToken(data.access_token);
+      }
+      return data;
+    } catch (err) {
+      return { error: err };
+    }
+  };
@@ -1,6 +1,6 @@
 const API_URL = import.meta.env.VITE_API_BASE_URL
 console.log(API_URL)
-import { getToken } from "../utils/store"; 
+import { getToken, getReadMarker, storeReadMarker } from "../utils/store"; 
 import axios from "axios"
 
 export const axiosInstance = axios.create({
@@ -17,6 +17,10 @@ axiosInstance.interceptors.request.use(
       if (token) {
         config.headers.Authorization = `Bearer ${token}`;
       }
+      const readMarker = getReadMarker();
+      if (readMarker) {
+        config.headers["X-Read-After"] = readMarker;
+      }
       return config;
     },
     (error) => Promise.reject(error)
@@ -24,7 +28,14 @@ axiosInstance.interceptors.request.use(
 
 
 axiosInstance.interceptors.response.use(
-    (response) => response.data,
+    (response) => {
+      // Set after our writes: later reads wait for the replica to catch up
+      const readMarker = response.headers["x-read-after"];
+      if (readMarker) {
+        storeReadMarker(readMarker);
+      }
+      return response.data;
+    },
     (error) => {
       const err = error.response?.data || { error: error.message };
       return Promise.reject(err);
@@ -1,9 +1,21 @@
 import { axiosInstance } from "./instance";
 
 
-export const getTasks = async () => {
+// params: { status, sort, order, limit, cursor } -> { items, next_cursor }
+export const getTasks = async (params = {}) => {
   try {
-    const data = await axiosInstance.get("/tasks/");
+    const data = await axiosInstance.get("/tasks/", { params });
+    return data;
+  } catch (err) {
+    return { error: err.response?.data || err.message };
+  }
+};
+
+
+// Server-side full-text search -> { items, next_cursor }
+export const searchTasks = async (q, params = {}) => {
+  try {
+    const data = await axiosInstance.get("/tasks/search", { params: { q, ...params } });
     return data;
   } catch (err) {
     return { error: err.response?.data || err.message };
@@ -16,7 +16,7 @@ export default function FilterPanel({ filters, onFiltersChange, className = "" }
         >
           <option value="all">All Tasks</option>
           <option value="todo">To Do</option>
-          <option value="in-progress">In Progress</option>
+          <option value="in_progress">In Progress</option>
           <option value="completed">Completed</option>
         </select>
       </div>
@@ -31,7 +31,7 @@ export default function FilterPanel({ filters, onFiltersChange, className = "" }
           <option value="created">Created Date</option>
           <option value="dueDate">Due Date</option>
           <option value="title">Title</option>
-          <option value="timeSpent">Time Spent</option>
+          <option value="status">Status</option>
         </select>
       </div>
 
@@ -22,6 +22,8 @@ export const AuthProvider = ({ children }) => {
       try {
         const userData = await verify_token();
         if (userData.error) throw userData.error;
+        // /auth/me only returns a token when the current one is close to expiry
+        if (userData.access_token) storeToken(userData.access_token);
         setUser(userData);
       } catch (err) {
         setUser(null);
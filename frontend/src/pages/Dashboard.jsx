@@ -9,7 +9,13 @@ import Chatbot from "../components/ai/Chatbot";
 import ChatbotTrigger from "../components/ai/ChatbotTrigger";
 
 import { useAuth } from "../context/AuthContext";
-import { getTasks, createTask, updateTask, deleteTask, updateTaskStatus } from "../apis/task";
+import { getTasks, searchTasks, createTask, updateTask, deleteTask, updateTaskStatus } from "../apis/task";
+
+const PAGE_SIZE = 50;
+const FREE_TASK_LIMIT = 10;
+const SEARCH_DEBOUNCE_MS = 300;
+// FilterPanel sortBy -> GET /tasks sort key
+const SORT_KEYS = { created: "created", dueDate: "due", title: "title", status: "status" };
 
 export default function Dashboard() {
   const { user, loading: authLoading } = useAuth();
@@ -21,74 +27,76 @@ export default function Dashboard() {
   const [searchTerm, setSearchTerm] = useState("");
   const [filters, setFilters] = useState({ status: "all", sortBy: "created", sortOrder: "desc" });
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [searchResults, setSearchResults] = useState(null);
+  // All of the user's tasks (server count from /auth/me), not just the loaded page
+  const [taskCount, setTaskCount] = useState(0);
+
+  const withTimeSpent = (task) => {
+    let timeSpent = 0;
+    const start = task.start_at ? new Date(task.start_at) : null;
+    const end = task.end_at ? new Date(task.end_at) : null;
+    if (start && end) {
+      timeSpent = Math.floor((end - start) / 60000); // in minutes
+    } else if (start) {
+      timeSpent = Math.floor((new Date() - start) / 60000);
+    }
+    return { ...task, timeSpent };
+  };
+
+  // Fetch a page of tasks from the API (filtering/sorting happen server-side)
+  const fetchTasks = async (cursor = null) => {
+    cursor ? setLoadingMore(true) : setLoading(true);
+    const params = { sort: SORT_KEYS[filters.sortBy] || "created", order: filters.sortOrder, limit: PAGE_SIZE };
+    if (filters.status !== "all") params.status = filters.status;
+    if (cursor) params.cursor = cursor;
 
-  // Fetch tasks from API
-  const fetchTasks = async () => {
-    setLoading(true);
-    const res = await getTasks();
+    const res = await getTasks(params);
     if (!res.error) {
-      const updatedTasks = res.map(task => {
-        let timeSpent = 0;
-        const start = task.start_at ? new Date(task.start_at) : null;
-        const end = task.end_at ? new Date(task.end_at) : null;
-        if (start && end) {
-          timeSpent = Math.floor((end - start) / 60000); // in minutes
-        } else if (start) {
-          timeSpent = Math.floor((new Date() - start) / 60000);
-        }
-        return { ...task, timeSpent };
-      });
-      setTasks(updatedTasks);
+      const page = res.items.map(withTimeSpent);
+      setTasks(prev => (cursor ? [...prev, ...page] : page));
+      setNextCursor(res.next_cursor || null);
     }
-    setLoading(false);
+    cursor ? setLoadingMore(false) : setLoading(false);
   };
 
   useEffect(() => {
     if (user) fetchTasks();
-  }, [user]);
+  }, [user, filters]);
 
-  // Filter and search tasks
   useEffect(() => {
-    let filtered = [...tasks];
+    if (user) setTaskCount(user.task_count ?? 0);
+  }, [user]);
 
-    if (searchTerm) {
-      filtered = filtered.filter(task =>
-        task.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        task.description.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
+  const atTaskLimit = user?.subscription_tier === "free" && taskCount >= FREE_TASK_LIMIT;
 
-    if (filters.status !== "all") {
-      filtered = filtered.filter(task => task.status === filters.status);
+  // Search runs server-side (ranked full-text), debounced while typing
+  useEffect(() => {
+    const term = searchTerm.trim();
+    if (!term) {
+      setSearchResults(null);
+      return;
     }
+    const handle = setTimeout(async () => {
+      const res = await searchTasks(term);
+      if (!res.error) setSearchResults(res.items.map(withTimeSpent));
+    }, SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(handle);
+  }, [searchTerm]);
 
-    filtered.sort((a, b) => {
-      let aValue, bValue;
-      switch (filters.sortBy) {
-        case "dueDate":
-          aValue = new Date(a.due_date);
-          bValue = new Date(b.due_date);
-          break;
-        case "timeSpent":
-          aValue = a.timeSpent;
-          bValue = b.timeSpent;
-          break;
-        case "title":
-          aValue = a.title.toLowerCase();
-          bValue = b.title.toLowerCase();
-          break;
-        default:
-          aValue = new Date(a.created_at);
-          bValue = new Date(b.created_at);
-      }
-      return filters.sortOrder === "asc" ? (aValue > bValue ? 1 : -1) : (aValue < bValue ? 1 : -1);
-    });
+  useEffect(() => {
+    setFilteredTasks(searchResults ?? tasks);
+  }, [tasks, searchResults]);
 
-    setFilteredTasks(filtered);
-  }, [tasks, searchTerm, filters]);
+  // Apply a local change to both the task list and any visible search results
+  const updateLoaded = (fn) => {
+    setTasks(fn);
+    setSearchResults(prev => (prev ? fn(prev) : prev));
+  };
 
   const handleCreateTask = () => {
-    if (user.subscription_tier === "free" && tasks.length >= 10) {
+    if (atTaskLimit) {
       alert("You've reached the maximum number of tasks for free users. Upgrade to Premium for unlimited tasks!");
       return;
     }
@@ -104,7 +112,8 @@ export default function Dashboard() {
       } else if (res.start_at) {
         timeSpent = Math.floor((new Date() - new Date(res.start_at)) / 60000);
       }
-      setTasks(prev => [...prev, { ...res, timeSpent }]);
+      setTasks(prev => [{ ...res, timeSpent }, ...prev]);
+      setTaskCount(count => count + 1);
       setIsCreateModalOpen(false);
     }
   };
@@ -118,7 +127,7 @@ export default function Dashboard() {
       } else if (res.start_at) {
         timeSpent = Math.floor((new Date() - new Date(res.start_at)) / 60000);
       }
-      setTasks(prev => prev.map(task => task.id === taskId ? { ...res, timeSpent } : task));
+      updateLoaded(prev => prev.map(task => task.id === taskId ? { ...res, timeSpent } : task));
     }
   };
 
@@ -131,7 +140,7 @@ export default function Dashboard() {
       } else if (res.start_at) {
         timeSpent = Math.floor((new Date() - new Date(res.start_at)) / 60000);
       }
-      setTasks(prev => prev.map(task => task.id === taskId ? { ...res, timeSpent } : task));
+      updateLoaded(prev => prev.map(task => task.id === taskId ? { ...res, timeSpent } : task));
     } else {
       alert("Failed to update task: " + res.error);
     }
@@ -140,7 +149,8 @@ export default function Dashboard() {
   const handleDeleteTask = async (taskId) => {
     const res = await deleteTask(taskId);
     if (!res.error) {
-      setTasks(prev => prev.filter(task => task.id !== taskId));
+      updateLoaded(prev => prev.filter(task => task.id !== taskId));
+      setTaskCount(count => Math.max(0, count - 1));
     }
   };
 
@@ -169,7 +179,7 @@ export default function Dashboard() {
             </div>
             <CustomButton
               onClick={handleCreateTask}
-              disabled={user.subscription_tier === "free" && tasks.length >= 10}
+              disabled={atTaskLimit}
               className="w-full lg:w-auto"
             >
               <Plus className="h-5 w-5 mr-2" />
@@ -185,9 +195,9 @@ export default function Dashboard() {
                   <AlertCircle className="h-5 w-5 text-amber-600 mr-3 mt-0.5 flex-shrink-0" />
                   <div>
                     <div className="font-medium text-amber-800">
-                      Free Plan: {tasks.length}/10 tasks used
+                      Free Plan: {taskCount}/{FREE_TASK_LIMIT} tasks used
                     </div>
-                    {tasks.length >= 10 && (
+                    {atTaskLimit && (
                       <p className="mt-1 text-sm text-amber-700">
                         You've reached your task limit. Upgrade to Premium for unlimited tasks!
                       </p>
@@ -254,6 +264,14 @@ export default function Dashboard() {
             ))}
           </div>
         )}
+
+        {nextCursor && !searchResults && (
+          <div className="flex justify-center mt-8">
+            <CustomButton variant="outline" onClick={() => fetchTasks(nextCursor)} disabled={loadingMore}>
+              {loadingMore ? "Loading..." : "Load more"}
+            </CustomButton>
+          </div>
+        )}
       </div>
 
       {user?.subscription_tier === "premium" ? (
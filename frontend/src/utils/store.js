@@ -1,3 +1,8 @@
 export const getToken = () => localStorage.getItem("access_token");
 
-export const storeToken = (token) => localStorage.setItem("access_token", token);
\ No newline at end of file
+export const storeToken = (token) => localStorage.setItem("access_token", token);
+
+// Read-your-writes marker from the API (X-Read-After), sent back on every request
+export const getReadMarker = () => localStorage.getItem("read_marker");
+
+export const storeReadMarker = (marker) => localStorage.setItem("read_marker", marker);
\ No newline at end of file
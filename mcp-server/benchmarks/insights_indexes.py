@@ -0,0 +1,139 @@
+"""
+Before/after benchmark for the TaskAnalyzer queries.
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for every insights statement against the
+configured database and records the median execution time, buffers touched
+and the indexes the plan used.
+
+    python -m benchmarks.insights_indexes --user-id <uuid> --label before > before.json
+    (cd ../backend && alembic upgrade head)
+    python -m benchmarks.insights_indexes --user-id <uuid> --label after > after.json
+    python -m benchmarks.insights_indexes --compare before.json after.json
+
+Use an account with a realistic number of tasks; plans on a handful of rows
+are always sequential scans. seed_tasks.sql creates one; the committed runs
+and their reading are in results/.
+"""
+import argparse
+import json
+import statistics
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from utils.database import engine
+from utils.deps import COMPLETION_STREAK_QUERY
+from utils.insights import (
+    USER_TASKS_QUERY,
+    TASK_STATISTICS_QUERY,
+    OVERDUE_TASKS_QUERY,
+    MONTHLY_STATISTICS_QUERY,
+    MONTHLY_CATEGORY_QUERY,
+)
+
+
+def _month_bounds():
+    start = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def benchmark_cases(user_id: str):
+    """(name, statement, params) for each query TaskAnalyzer issues"""
+    start, end = _month_bounds()
+    window = datetime.now(timezone.utc) - timedelta(days=60)
+    return [
+        ("user_tasks", USER_TASKS_QUERY, {"owner_id": user_id, "date_filter": window}),
+        ("task_statistics", TASK_STATISTICS_QUERY, {"owner_id": user_id, "date_filter": window}),
+        ("overdue_tasks", OVERDUE_TASKS_QUERY, {"owner_id": user_id, "date_filter": window, "limit": 5}),
+        ("monthly_statistics", MONTHLY_STATISTICS_QUERY,
+         {"owner_id": user_id, "start_date": start, "end_date": end}),
+        ("monthly_category", MONTHLY_CATEGORY_QUERY,
+         {"owner_id": user_id, "start_date": start, "end_date": end}),
+        ("completion_streak", COMPLETION_STREAK_QUERY,
+         {"user_id": user_id, "start_date": start, "end_date": end}),
+    ]
+
+
+def _plan_indexes(node, found=None):
+    found = set() if found is None else found
+    if "Index Name" in node:
+        found.add(f"{node['Node Type']}: {node['Index Name']}")
+    for child in node.get("Plans", []):
+        _plan_indexes(child, found)
+    return found
+
+
+def run(user_id: str, label: str, repeat: int) -> dict:
+    results = {}
+    with engine.connect() as connection:
+        for name, statement, params in benchmark_cases(user_id):
+            explain = text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement.text)
+            timings, plan = [], None
+            # First run warms the cache and is discarded
+            for attempt in range(repeat + 1):
+                output = connection.execute(explain, params).scalar_one()
+                plan = (json.loads(output) if isinstance(output, str) else output)[0]
+                if attempt:
+                    timings.append(plan["Execution Time"])
+            root = plan["Plan"]
+            results[name] = {
+                "median_ms": round(statistics.median(timings), 3),
+                "min_ms": round(min(timings), 3),
+                "shared_hit": root.get("Shared Hit Blocks", 0),
+                "shared_read": root.get("Shared Read Blocks", 0),
+                "indexes": sorted(_plan_indexes(root)),
+            }
+            connection.rollback()
+    return {"label": label, "user_id": user_id, "repeat": repeat, "queries": results}
+
+
+def _buffers(result: dict) -> int:
+    return result["shared_hit"] + result["shared_read"]
+
+
+def compare(before_path: str, after_path: str) -> str:
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    lines = [
+        f"{'query':<20} {before['label']:>12} {after['label']:>12} {'speedup':>8} "
+        f"{'buffers':>15}  indexes ({after['label']})"
+    ]
+    for name, old in before["queries"].items():
+        new = after["queries"].get(name)
+        if new is None:
+            continue
+        speedup = old["median_ms"] / new["median_ms"] if new["median_ms"] else float("inf")
+        buffers = f"{_buffers(old)}->{_buffers(new)}"
+        lines.append(
+            f"{name:<20} {old['median_ms']:>10.3f}ms {new['median_ms']:>10.3f}ms {speedup:>7.1f}x "
+            f"{buffers:>15}  {', '.join(new['indexes']) or 'seq scan'}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark TaskAnalyzer queries")
+    parser.add_argument("--user-id", help="Owner whose tasks are queried")
+    parser.add_argument("--label", default="run", help="Name stored with the results, e.g. before/after")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        print(compare(*args.compare))
+        return 0
+    if not args.user_id:
+        parser.error("--user-id is required unless --compare is given")
+
+    json.dump(run(args.user_id, args.label, args.repeat), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+-- Synthetic data set for insights_indexes.py (run on an empty database at
+-- the revision under test): one heavy account with 200k tasks and 19 others
+-- with 20k each, created over the last two years.
+--
+--   psql "$DATABASE_URL" -f benchmarks/seed_tasks.sql
+--   python -m benchmarks.insights_indexes --user-id 00000000-0000-0000-0000-000000000001 ...
+
+INSERT INTO users (id, email, fullname, hashed_password, is_active, created_at, updated_at)
+SELECT ('00000000-0000-0000-0000-' || lpad(to_hex(n), 12, '0'))::uuid,
+       'bench' || n || '@example.com', 'Bench ' || n, 'x', true, now(), now()
+FROM generate_series(1, 20) AS n;
+
+INSERT INTO tasks (id, owner_id, title, description, status, due_date,
+                   created_at, updated_at, start_at, end_at)
+SELECT gen_random_uuid(), u.id,
+       'Task ' || t,
+       CASE WHEN t % 3 = 0 THEN 'Notes for task ' || t END,
+       (ARRAY['todo', 'in_progress', 'completed', 'completed'])[1 + t % 4]::task_status,
+       created + make_interval(days => t % 21),
+       created + make_interval(hours => t % 200),
+       created + make_interval(hours => t % 200),
+       CASE WHEN t % 4 > 0 THEN created + make_interval(hours => 1) END,
+       CASE WHEN t % 4 > 1 THEN created + make_interval(hours => 1 + t % 9) END
+FROM users u
+CROSS JOIN LATERAL generate_series(1, CASE WHEN u.email = 'bench1@example.com' THEN 200000 ELSE 20000 END) AS t
+CROSS JOIN LATERAL (SELECT now() - make_interval(secs => (t * 7919 % 63072000))) AS c(created)
+WHERE u.email LIKE 'bench%@example.com';
+
+VACUUM ANALYZE tasks;
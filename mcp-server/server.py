@@ -1,6 +1,6 @@
 import os
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 import json
 import logging
@@ -9,16 +9,25 @@ import google.generativeai as genai
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 import httpx
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from utils.api import settings
 from utils.insights import TaskAnalyzer
-from utils.database import engine
+from utils.database import engine, all_pool_stats, all_statement_stats
 from utils.deps import calculate_completion_streak, calculate_productivity_score
 
 # Initialize FastMCP server
 mcp = FastMCP(name="Smart Task Manager AI",host="0.0.0.0", port=8000)
 logger = logging.getLogger(__name__)
 
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> JSONResponse:
+    """Connection pool and compiled statement cache counters for this process"""
+    return JSONResponse({"db_pools": all_pool_stats(), "db_statements": all_statement_stats()})
+
+
 if settings.GEMINI_API_KEY:
     genai.configure(api_key=settings.GEMINI_API_KEY)
     model = genai.GenerativeModel('gemini-2.0-flash-exp')
@@ -26,20 +35,21 @@ if settings.GEMINI_API_KEY:
 
 
 @mcp.tool()
-def query_task_data(user_id: str, query: str) -> str:
+def query_task_data(user_id: str, query: str, consistent: bool = False) -> str:
     """
     Answer natural language questions about user's task data using AI.
     
     Args:
         user_id: The ID of the user making the query
         query: Natural language question about tasks
+        consistent: Read from the primary instead of the replica (user just wrote)
     
     Returns:
         AI-generated answer based on user's task data
     """
     logger.info(f"User id for tasks {user_id}")
     try:
-        analyzer = TaskAnalyzer()
+        analyzer = TaskAnalyzer(consistent=consistent)
         
         # Get comprehensive task data
         tasks = analyzer.get_user_tasks(user_id, 60) 
@@ -72,7 +82,13 @@ def query_task_data(user_id: str, query: str) -> str:
             
             elif "overdue" in query_lower:
                 overdue = stats.get('overdue_tasks', 0)
-                return f"You have {overdue} overdue tasks that need attention."
+                answer = f"You have {overdue} overdue tasks that need attention."
+                latest = analyzer.get_overdue_tasks(user_id, 60)
+                if latest:
+                    answer += " Most recently due: " + ", ".join(
+                        f"{task['title']} ({task['due_date'][:10]})" for task in latest
+                    ) + "."
+                return answer
             
             elif "completion" in query_lower or "completed" in query_lower:
                 completed = stats.get('completed_tasks', 0)
@@ -89,13 +105,14 @@ def query_task_data(user_id: str, query: str) -> str:
 
 
 @mcp.tool()
-def get_monthly_summary(user_id: str, month_offset: int = 0) -> str:
+def get_monthly_summary(user_id: str, month_offset: int = 0, consistent: bool = False) -> str:
     """
     Get comprehensive monthly summary data for the user's tasks.
     
     Args:
         user_id: The ID of the user requesting the summary
         month_offset: Number of months back from current month (0 = current month, 1 = last month, etc.)
+        consistent: Read from the primary instead of the replica (user just wrote)
     
     Returns:
         JSON string containing complete monthly summary data
@@ -103,10 +120,10 @@ def get_monthly_summary(user_id: str, month_offset: int = 0) -> str:
     logger.info(f"Generating monthly summary for user {user_id}, month_offset: {month_offset}")
     
     try:
-        analyzer = TaskAnalyzer()
+        analyzer = TaskAnalyzer(consistent=consistent)
         
         # Calculate date range for the requested month
-        now = datetime.now()
+        now = datetime.now(timezone.utc)
         target_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
         # Go back to the requested month
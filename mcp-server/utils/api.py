@@ -25,6 +25,20 @@ class Settings(BaseSettings):
     PG_PASSWORD : str
     PG_DB : str
 
+    # Connection pool, per engine (primary and replica). psycopg2 never
+    # prepares statements server-side, so PgBouncer transaction pooling works
+    # as is; PGBOUNCER only drops startup parameters it would reject.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 3600
+    PGBOUNCER: bool = False
+    DB_COMPILED_CACHE_SIZE: int = 500  # SQLAlchemy query_cache_size, per engine
+
+    # Read replica (optional) for TaskAnalyzer queries
+    PG_REPLICA_HOST: str | None = None
+    PG_REPLICA_PORT: int | None = None  # defaults to PG_PORT
+
     @property
     def SQLALCHEMY_DATABASE_URL(self) -> str:
         """Async SQLAlchemy URL for asyncpg"""
@@ -33,6 +47,16 @@ class Settings(BaseSettings):
             f"@{self.PG_HOST}:{self.PG_PORT}/{self.PG_DB}"
         )
 
+    @property
+    def SQLALCHEMY_REPLICA_URL(self) -> str | None:
+        """SQLAlchemy URL for the read replica, None without one"""
+        if not self.PG_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql://{self.PG_USER}:{self.PG_PASSWORD}"
+            f"@{self.PG_REPLICA_HOST}:{self.PG_REPLICA_PORT or self.PG_PORT}/{self.PG_DB}"
+        )
+
     # Load environment variables from .env file
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
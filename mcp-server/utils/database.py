@@ -1,7 +1,56 @@
 from utils.api import settings
+from utils.pools import InstrumentedPool, PoolTelemetry, pool_stats
+from utils.statements import StatementTelemetry, statement_stats
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+# (engine, StatementTelemetry) by name, for /metrics
+engines = {}
+
+
+def _create_engine(name: str, url: str, **connect_args):
+    if settings.PGBOUNCER:
+        # PgBouncer rejects the `options` startup parameter
+        connect_args.pop("options", None)
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        query_cache_size=settings.DB_COMPILED_CACHE_SIZE,
+        connect_args=connect_args,
+    )
+    engine.pool.telemetry = PoolTelemetry(name)
+    statements = StatementTelemetry(name)
+    statements.attach(engine)
+    engines[name] = (engine, statements)
+    return engine
+
+
+engine = _create_engine("primary", settings.SQLALCHEMY_DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Analytics read from the replica when one is configured; its sessions are read-only
+read_engine = engine
+if settings.SQLALCHEMY_REPLICA_URL:
+    read_engine = _create_engine(
+        "replica",
+        settings.SQLALCHEMY_REPLICA_URL,
+        options="-c default_transaction_read_only=on",
+    )
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+def all_pool_stats():
+    return {name: pool_stats(pool_engine) for name, (pool_engine, _) in engines.items()}
+
+
+def all_statement_stats():
+    return {
+        name: statement_stats(pool_engine, statements)
+        for name, (pool_engine, statements) in engines.items()
+    }
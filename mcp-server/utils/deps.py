@@ -1,4 +1,17 @@
-from sqlalchemy import text
+from utils.insights import hot_and_archive, reads_archive
+
+
+# Per-day completions in a month (owner_id + created_at range, index-only)
+COMPLETION_STREAK_QUERY, COMPLETION_STREAK_ARCHIVE_QUERY = hot_and_archive("""
+    SELECT DATE(created_at) as task_date, 
+           COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_count
+    FROM {tasks} 
+    WHERE owner_id = :user_id 
+    AND created_at >= :start_date 
+    AND created_at < :end_date
+    GROUP BY DATE(created_at)
+    ORDER BY task_date DESC
+""")
 
 
 def calculate_productivity_score(stats):
@@ -37,16 +50,7 @@ def calculate_completion_streak(analyzer, user_id, start_date, end_date):
     """Calculate the current completion streak for the month"""
     try:
         # Get daily completion data for the month
-        query = text("""
-            SELECT DATE(created_at) as task_date, 
-                   COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_count
-            FROM tasks 
-            WHERE owner_id = :user_id 
-            AND created_at >= :start_date 
-            AND created_at < :end_date
-            GROUP BY DATE(created_at)
-            ORDER BY task_date DESC
-        """)
+        query = COMPLETION_STREAK_ARCHIVE_QUERY if reads_archive(analyzer.db, user_id, start_date) else COMPLETION_STREAK_QUERY
         
         result = analyzer.db.execute(query, {
             "user_id": user_id,
@@ -0,0 +1,57 @@
+"""
+Compiled-cache telemetry for the MCP engines, mirroring the compiled_cache
+part of backend/config/statements.py. A copy for the same reason as
+utils/pools.py (separate build contexts); psycopg2 has no prepared
+statement cache, so that half of the backend module does not apply here.
+"""
+import threading
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+
+class StatementTelemetry:
+    """
+    SQLAlchemy compiled cache counters for one engine. The insights
+    statements are module-level text() constructs, so after the first call
+    each is a cache hit. psycopg2 sends every query as a simple query
+    (no server-side prepared statements), so there is no prepare count here.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.compiled_hits = 0
+        self.compiled_misses = 0
+        self.uncached = 0
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.executions += 1
+            if context.cache_hit is CACHE_HIT:
+                self.compiled_hits += 1
+            elif context.cache_hit is CACHE_MISS:
+                self.compiled_misses += 1
+            else:
+                self.uncached += 1
+
+    def attach(self, engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+def statement_stats(engine, telemetry: StatementTelemetry) -> Dict[str, Any]:
+    compiled_cache = engine._compiled_cache
+    compiled = telemetry.compiled_hits + telemetry.compiled_misses
+    return {
+        "executions": telemetry.executions,
+        "compiled_cache": {
+            "size": len(compiled_cache) if compiled_cache is not None else 0,
+            "max_size": compiled_cache.capacity if compiled_cache is not None else 0,
+            "hits": telemetry.compiled_hits,
+            "misses": telemetry.compiled_misses,
+            "uncached": telemetry.uncached,
+            "hit_rate": round(telemetry.compiled_hits / compiled, 4) if compiled else 0.0,
+        },
+    }